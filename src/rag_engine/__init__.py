@@ -2,13 +2,16 @@ from .indexing.index_engine import IndexingEngine
 from .indexing.embedder import Embedder
 from .indexing.vector_store import VectorStore
 from .ingestion.chunker import TextChunker 
+# Loaders are re-exported for callers; RagEngine itself goes through load_paths
 from .ingestion.loaders import DocumentLoader
 from .ingestion.loaders import PDFLoader
 from .ingestion.loaders import CSVLoader
 from .ingestion.loaders import TXTLoader
+from .ingestion.loaders import load_paths
 from .retrieval.retriever import Retriever
 from .retrieval.generator import LLMGenerator 
 from typing import List, Dict
+import asyncio
 
 __all__ = [
     "IndexingEngine",
@@ -18,6 +21,7 @@ __all__ = [
     "DocumentLoader",
     "PDFLoader",
     "CSVLoader",
+    "TXTLoader",
     "Retriever",
     "LLMGenerator"
 ]
@@ -30,8 +34,8 @@ class RagEngine:
         if isinstance(data_files, str):
             data_files = [data_files]
         
-        loader = self._choose_loader(data_files)
-        docs = loader.load(data_files)
+        # Group files by extension in one pass, each loader gets its own group
+        docs = load_paths(data_files)
 
         # 2) Split into chunks
         chunker = TextChunker()
@@ -54,22 +58,6 @@ class RagEngine:
         self.retriever = Retriever(vector_store=vs, embedder=embedder)
         self.generator = LLMGenerator(model=model_name)
 
-    def _choose_loader(self, data_files):
-        # Ensure list
-        if isinstance(data_files, str):
-            data_files = [data_files]
-
-        filename = data_files[0].lower()
-
-        if filename.endswith(".pdf"):
-            return PDFLoader()
-        elif filename.endswith(".csv"):
-            return CSVLoader()
-        elif filename.endswith(".txt"):
-            return TXTLoader()
-        else:
-            raise ValueError(f"Unsupported file type: {filename}")
-
     # Function 1
     def query(self, question: str, top_k: int = 5) -> str:
         docs = self.retriever.retrieve(question, k=top_k)
@@ -118,8 +106,7 @@ class RagEngine:
         """
         Ingest additional documents into the existing knowledge base.
         """
-        loader = self._choose_loader(file_paths)
-        docs = loader.load(file_paths)
+        docs = load_paths(file_paths)
         
         chunker = TextChunker()
         chunks = chunker.chunk_docs(docs)
@@ -130,4 +117,16 @@ class RagEngine:
             return "No valid content found in the provided files"
         
         self.retriever.vs.add_documents(chunks)
-        return f"Successfully added {len(chunks)} new chunks to the knowledge base."
\ No newline at end of file
+        return f"Successfully added {len(chunks)} new chunks to the knowledge base."
+
+    # Function 6
+    def answer_with_eval(self, question: str, top_k: int = 5) -> Dict[str, str]:
+        """
+        Answer a question, summarize the retrieved context and rate the answer.
+        The answer and summary requests run concurrently, so this is faster than
+        calling query, summary and evaluate_relevance one after another.
+        Must be called from synchronous code (it starts its own event loop).
+        """
+        docs = self.retriever.retrieve(question, k=top_k)
+        # answer_and_evaluate closes its client before this loop ends
+        return asyncio.run(self.generator.answer_and_evaluate(question, docs))
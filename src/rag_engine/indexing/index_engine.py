@@ -4,9 +4,12 @@ This module coordinates the complete indexing pipeline.
 """
 
 import os
-from typing import List, Optional, Dict, Set
+import stat
+from typing import List, Optional, Dict, Set, Tuple
 from langchain_core.documents import Document
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
 import logging
 
 
@@ -23,18 +26,42 @@ from .vector_store import VectorStore
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# File types the engine can load, built once at import
+SUPPORTED_EXTENSIONS = frozenset({".txt", ".csv", ".pdf"})
+
+@lru_cache(maxsize=4096)
+def _normalize_path(file_path: str, cwd: str) -> Tuple[str, str]:
+    """
+    Normalize a file path once per (path, working directory).
+    
+    Relative paths resolve against cwd, so it is part of the cache key.
+    
+    Args:
+        file_path: Path as given by the caller
+        cwd: Current working directory
+        
+    Returns:
+        Tuple of (absolute path, lowercased extension)
+    """
+    abs_path = os.path.abspath(os.path.join(cwd, file_path))
+    return abs_path, os.path.splitext(file_path)[1].lower()
+
 # User-defined Exceptions
 class IndexingException(Exception):
     """Base exception for indexing operations."""
     pass
 
 
-class FileValidationError(IndexingException):
-    """Raised when file validation fails."""
+class FileValidationError(IndexingException, ValueError):
+    """Raised when file validation fails. Also a ValueError, which it replaced."""
     pass
 
-class LoaderError(IndexingException):
-    """Raised when document loading fails."""
+class MissingFileError(FileValidationError, FileNotFoundError):
+    """Raised when the file does not exist. Also a FileNotFoundError, which it replaced."""
+    pass
+
+class LoaderError(IndexingException, ValueError):
+    """Raised when document loading fails. Also a ValueError, which it replaced."""
     pass
 
 class ChunkingError(IndexingException):
@@ -74,7 +101,17 @@ class IndexingEngine:
             embedding_model: HuggingFace embedding model name
             chunk_size: Maximum characters per chunk
             overlap: Overlapping characters between chunks
+            
+        Raises:
+            IndexingException: If chunk_size or overlap is out of range
         """
+        if chunk_size <= 0:
+            raise IndexingException("chunk_size must be positive")
+        if overlap < 0:
+            raise IndexingException("overlap cannot be negative")
+        if overlap >= chunk_size:
+            raise IndexingException("overlap must be less than chunk_size")
+        
         self.chunker = TextChunker(chunk_size=chunk_size, overlap=overlap)
         self.embedder = Embedder(model_name=embedding_model)
         self.vector_store = VectorStore(
@@ -89,7 +126,46 @@ class IndexingEngine:
         self._indexed_files: Set[str] = set()
         self._failed_files: Dict[str, str] = {}
         self._indexing_history: List[Dict] = []
-        self._supported_extensions = {'.pdf', '.csv', '.txt'}
+        self._supported_extensions = SUPPORTED_EXTENSIONS
+    
+    def _stat_validate(self, file_path: str) -> os.stat_result:
+        """
+        Validate a file with a single stat call.
+        
+        One os.stat() answers existence, file type and size together,
+        instead of separate exists/isfile/getsize lookups.
+        
+        Args:
+            file_path: Path to file to validate
+            
+        Returns:
+            The stat result of the file
+            
+        Raises:
+            MissingFileError: If file doesn't exist
+            FileValidationError: If the path is empty, not a regular file,
+                empty, or has an unsupported extension
+        """
+        if not file_path:
+            raise FileValidationError("File path cannot be empty")
+        
+        try:
+            st = os.stat(file_path)
+        except (OSError, ValueError):
+            # Same cases os.path.exists reports as missing
+            raise MissingFileError(f"File not found: {file_path}")
+        
+        if not stat.S_ISREG(st.st_mode):
+            raise FileValidationError(f"Path is not a file: {file_path}")
+        
+        if st.st_size == 0:
+            raise FileValidationError(f"File is empty: {file_path}")
+        
+        ext = _normalize_path(file_path, os.getcwd())[1]
+        if ext not in SUPPORTED_EXTENSIONS:
+            raise FileValidationError(f"Unsupported file extension: {ext}")
+        
+        return st
     
     def _validate_file(self, file_path: str) -> None:
         """
@@ -105,30 +181,14 @@ class IndexingEngine:
             file_path: Path to file to validate
             
         Raises:
-            FileNotFoundError: If file doesn't exist
-            ValueError: If file is invalid
+            MissingFileError: If file doesn't exist
+            FileValidationError: If file is invalid
         """
-        
-        if not os.path.exists(file_path):
-            raise FileNotFoundError(f"File not found: {file_path}")
-        
-        if not os.path.isfile(file_path):
-            raise ValueError(f"Path is not a file: {file_path}")
-        
-        file_size = os.path.getsize(file_path)
-        if file_size == 0:
-            raise ValueError(f"File is empty: {file_path}")
-        
-        ext = os.path.splitext(file_path)[1].lower()
-        if ext not in self._supported_extensions:
-            raise ValueError(
-                f"Unsupported file type: {ext}. "
-                f"Supported types: {', '.join(self._supported_extensions)}"
-            )
+        self._stat_validate(file_path)
         
         # Check read permissions
         if not os.access(file_path, os.R_OK):
-            raise ValueError(f"File is not readable: {file_path}")
+            raise FileValidationError(f"File is not readable: {file_path}")
     
     def _get_loader(self, file_path: str) -> DocumentLoader:
         """
@@ -141,8 +201,11 @@ class IndexingEngine:
             
         Returns:
             Appropriate DocumentLoader instance
+            
+        Raises:
+            LoaderError: If no loader handles the extension
         """
-        ext = os.path.splitext(file_path)[1].lower()
+        ext = _normalize_path(file_path, os.getcwd())[1]
         
         loader_map = {
             '.pdf': PDFLoader,
@@ -152,7 +215,7 @@ class IndexingEngine:
         
         loader_class = loader_map.get(ext)
         if not loader_class:
-            raise ValueError(f"No loader available for extension: {ext}")
+            raise LoaderError(f"No loader available for extension: {ext}")
         
         return loader_class()
     
@@ -169,7 +232,7 @@ class IndexingEngine:
             True if file was already indexed
         """
         # Normalize path for comparison
-        normalized_path = os.path.abspath(file_path)
+        normalized_path = _normalize_path(file_path, os.getcwd())[0]
         return normalized_path in self._indexed_files
     
     def index(
@@ -214,8 +277,9 @@ class IndexingEngine:
                 print(f"File validation passed")
             
             # Step 2: Check for duplicates
-            normalized_path = os.path.abspath(file_path)
-            if self._check_duplicate(file_path) and not force_reindex:
+            # Normalize once and reuse for both the lookup and the add below
+            normalized_path = _normalize_path(file_path, os.getcwd())[0]
+            if normalized_path in self._indexed_files and not force_reindex:
                 if verbose:
                     print(f"Warning: File already indexed. Use force_reindex=True to re-index.")
                 return []
@@ -304,13 +368,14 @@ class IndexingEngine:
         file_paths: List[str], 
         metadata: Optional[dict] = None,
         continue_on_error: bool = True,
-        verbose: bool = True
+        verbose: bool = True,
+        max_workers: int = 1
     ) -> Dict[str, List[Document]]:
         """
         Index multiple files in batch with error handling.
         
         Custom batch processing:
-        - Processes files sequentially
+        - Processes files sequentially, or in a thread pool
         - Optional error recovery
         - Aggregated progress reporting
         - Summary statistics
@@ -320,10 +385,17 @@ class IndexingEngine:
             metadata: Metadata to apply to all files
             continue_on_error: Continue if a file fails
             verbose: Print progress
+            max_workers: Number of files indexed concurrently (1 = sequential)
             
         Returns:
             Dictionary mapping file paths to their chunks
+            
+        Raises:
+            ValueError: If file_paths is None
         """
+        if file_paths is None:
+            raise ValueError("file_paths cannot be None")
+        
         results = {}
         successful = 0
         failed = 0
@@ -333,31 +405,36 @@ class IndexingEngine:
             print(f"Batch indexing {len(file_paths)} file(s)")
             print(f"{'='*60}\n")
         
-        for i, file_path in enumerate(file_paths, 1):
-            if verbose:
-                print(f"[{i}/{len(file_paths)}] Processing: {file_path}")
+        if max_workers > 1 and len(file_paths) > 1:
+            results, successful, failed = self._batch_index_parallel(
+                file_paths, metadata, continue_on_error, verbose, max_workers
+            )
+        else:
+            for i, file_path in enumerate(file_paths, 1):
+                if verbose:
+                    print(f"[{i}/{len(file_paths)}] Processing: {file_path}")
             
-            try:
-                chunks = self.index(
-                    file_path, 
-                    metadata=metadata, 
-                    verbose=False
-                )
-                results[file_path] = chunks
-                successful += 1
+                try:
+                    chunks = self.index(
+                        file_path, 
+                        metadata=metadata, 
+                        verbose=False
+                    )
+                    results[file_path] = chunks
+                    successful += 1
                 
-                if verbose:
-                    print(f"Success: {len(chunks)} chunks created\n")
+                    if verbose:
+                        print(f"Success: {len(chunks)} chunks created\n")
                     
-            except Exception as e:
-                failed += 1
-                results[file_path] = []
+                except Exception as e:
+                    failed += 1
+                    results[file_path] = []
                 
-                if verbose:
-                    print(f"Failed: {e}\n")
+                    if verbose:
+                        print(f"Failed: {e}\n")
                 
-                if not continue_on_error:
-                    raise
+                    if not continue_on_error:
+                        raise
         
         if verbose:
             print(f"{'='*60}")
@@ -368,6 +445,89 @@ class IndexingEngine:
         
         return results
     
+    def _batch_index_parallel(
+        self,
+        file_paths: List[str],
+        metadata: Optional[dict],
+        continue_on_error: bool,
+        verbose: bool,
+        max_workers: int
+    ):
+        """
+        Index files concurrently in a thread pool.
+        
+        Threads mostly overlap while waiting on file and embedding I/O;
+        pure-Python parsing and chunking still run one at a time.
+        
+        Results and counts match the sequential path: a repeat of an
+        already-indexed file gets [] and counts as a success, and a repeat
+        of a failed file fails again.
+        
+        Returns:
+            Tuple of (results in input order, successful count, failed count)
+        """
+        chunks_by_file: Dict[str, List[Document]] = {}
+        failed_files = set()
+        successful = 0
+        failed = 0
+        
+        # Key each path by the file it names, so "a.txt" and "./a.txt" count once
+        cwd = os.getcwd()
+        keys = [
+            _normalize_path(file_path, cwd)[0] if isinstance(file_path, str) else file_path
+            for file_path in file_paths
+        ]
+        first_path = {}
+        for key, file_path in zip(keys, file_paths):
+            first_path.setdefault(key, file_path)
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # Submit each file once so duplicates cannot race each other
+            futures = {
+                executor.submit(self.index, file_path, metadata=metadata, verbose=False): key
+                for key, file_path in first_path.items()
+            }
+            
+            for done, future in enumerate(as_completed(futures), 1):
+                key = futures[future]
+                file_path = first_path[key]
+                try:
+                    chunks = future.result()
+                    chunks_by_file[key] = chunks
+                    successful += 1
+                    
+                    if verbose:
+                        print(f"[{done}/{len(futures)}] {file_path}: {len(chunks)} chunks created")
+                        
+                except Exception as e:
+                    failed += 1
+                    chunks_by_file[key] = []
+                    failed_files.add(key)
+                    
+                    if verbose:
+                        print(f"[{done}/{len(futures)}] {file_path}: failed: {e}")
+                    
+                    if not continue_on_error:
+                        for pending in futures:
+                            pending.cancel()
+                        raise
+        
+        # Report in the same order the files were given
+        results = {}
+        seen = set()
+        for key, file_path in zip(keys, file_paths):
+            if key not in seen:
+                seen.add(key)
+                results[file_path] = chunks_by_file[key]
+                continue
+            # Sequentially, a repeat is skipped as a duplicate or fails again
+            results[file_path] = []
+            if key in failed_files:
+                failed += 1
+            else:
+                successful += 1
+        return results, successful, failed
+    
     def search(
         self, 
         query: str, 
@@ -443,8 +603,16 @@ class IndexingEngine:
             "vector_store": self.vector_store.get_statistics()
         }
     
-    def reset_history(self):
-        """Clear indexing history (keeps indexed files)."""
+    def reset_history(self, include_indexed_files: bool = False):
+        """
+        Clear indexing history.
+        
+        Args:
+            include_indexed_files: Also forget which files were indexed, so
+                they are no longer treated as duplicates
+        """
         self._indexing_history.clear()
         self._failed_files.clear()
+        if include_indexed_files:
+            self._indexed_files.clear()
         print("Indexing history reset")
\ No newline at end of file
@@ -8,6 +8,7 @@ from langchain_core.documents import Document
 from langchain_chroma import Chroma
 from datetime import datetime
 import os
+import threading
 
 
 class VectorStore:
@@ -37,6 +38,7 @@ class VectorStore:
         self.persist_dir = persist_dir
         
         # Custom document tracking
+        self._lock = threading.Lock()
         self._doc_count = 0
         self._metadata_index: Dict[str, Dict] = {}
         self._source_index: Dict[str, List[str]] = {}
@@ -67,33 +69,35 @@ class VectorStore:
         """
         doc_ids = []
         
-        for doc in docs:
-            # Assign unique document ID
-            doc_id = f"doc_{self._doc_count:06d}"
-            doc_ids.append(doc_id)
+        # ID assignment must be atomic when files are indexed from threads
+        with self._lock:
+            for doc in docs:
+                # Assign unique document ID
+                doc_id = f"doc_{self._doc_count:06d}"
+                doc_ids.append(doc_id)
             
-            # Extract source from metadata - handle both old and new format
-            # New format uses "path", old format uses "source"
-            source = doc.metadata.get("path") or doc.metadata.get("source", "unknown")
+                # Extract source from metadata - handle both old and new format
+                # New format uses "path", old format uses "source"
+                source = doc.metadata.get("path") or doc.metadata.get("source", "unknown")
             
-            # Custom metadata tracking
-            self._metadata_index[doc_id] = {
-                "source": source,
-                "timestamp": datetime.now().isoformat(),
-                "content_length": len(doc.page_content),
-                "original_metadata": doc.metadata.copy()
-            }
+                # Custom metadata tracking
+                self._metadata_index[doc_id] = {
+                    "source": source,
+                    "timestamp": datetime.now().isoformat(),
+                    "content_length": len(doc.page_content),
+                    "original_metadata": doc.metadata.copy()
+                }
             
-            # Index by source for fast lookups
-            if source not in self._source_index:
-                self._source_index[source] = []
-            self._source_index[source].append(doc_id)
+                # Index by source for fast lookups
+                if source not in self._source_index:
+                    self._source_index[source] = []
+                self._source_index[source].append(doc_id)
             
-            # Add doc_id to document metadata
-            doc.metadata["doc_id"] = doc_id
-            doc.metadata["indexed_at"] = datetime.now().isoformat()
+                # Add doc_id to document metadata
+                doc.metadata["doc_id"] = doc_id
+                doc.metadata["indexed_at"] = datetime.now().isoformat()
             
-            self._doc_count += 1
+                self._doc_count += 1
         
         # Add to vector store
         self.store.add_documents(docs)
@@ -143,6 +147,29 @@ class VectorStore:
         
         return results
     
+    def search_by_vectors(self, embeddings, k: int = 5, filter: dict = None) -> List[List[Document]]:
+        """
+        Search for many precomputed query vectors in a single Chroma query.
+        
+        Args:
+            embeddings: One query vector per row
+            k: Number of results per query
+            filter: Optional metadata filter
+            
+        Returns:
+            One list of Document objects per query vector, in the same order
+        """
+        results = self.store._collection.query(
+            query_embeddings=embeddings,
+            n_results=k,
+            where=filter,
+            include=["documents", "metadatas"]
+        )
+        return [
+            [Document(page_content=text, metadata=meta or {}) for text, meta in zip(texts, metas)]
+            for texts, metas in zip(results["documents"], results["metadatas"])
+        ]
+    
     def search_by_source(self, query: str, source: str, k: int = 5) -> List[Document]:
         """
         Custom search within a specific source.
@@ -1,4 +1,4 @@
 from .chunker import TextChunker
-from .loaders import DocumentLoader, PDFLoader, CSVLoader, TXTLoader
+from .loaders import DocumentLoader, PDFLoader, CSVLoader, TXTLoader, load_paths
 
-__all__ = ["TextChunker", "DocumentLoader", "PDFLoader", "CSVLoader", "TextLoader"]
\ No newline at end of file
+__all__ = ["TextChunker", "DocumentLoader", "PDFLoader", "CSVLoader", "TextLoader", "load_paths"]
\ No newline at end of file
@@ -1,4 +1,4 @@
-from typing import List
+from typing import Iterable, Iterator, List
 from langchain_core.documents import Document
 
 class TextChunker:
@@ -24,36 +24,40 @@ class TextChunker:
             result.extend(parts)
         return result
 
+    def chunk_iter(self, docs: Iterable[Document]) -> Iterator[Document]:
+        #same chunks as chunk_docs, but yielded one at a time
+        #so callers can stream big corpora without holding every chunk
+        for d in docs:
+            yield from self._chunk_one_iter(d)
+
     def chunk_one(self, doc: Document) -> List[Document]:
         #split one doc
+        return list(self._chunk_one_iter(doc))
+
+    def _chunk_one_iter(self, doc: Document) -> Iterator[Document]:
+        #checks run now, chunks are built lazily
         if not isinstance(doc, Document):
             raise TypeError("doc must be a Document")
         t = doc.page_content
         if not isinstance(t, str):
             raise TypeError("page_content must be a string")
 
-        res = []
-        start = 0
+        #protect against bad settings during runtime
+        if self.overlap >= self.chunk_size:
+            raise ValueError("overlap must stay smaller than chunk_size")
 
-        while start < len(t):
-            end = start + self.chunk_size
-            piece = t[start:end]
+        #all window starts in one go, each window moves by size - overlap
+        size = self.chunk_size
+        starts = range(0, len(t), size - self.overlap)
+        base_meta = doc.metadata
 
-            meta2 = dict(doc.metadata)
-            meta2["chunk"] = len(res)
-
-            new_doc = Document(
-                page_content=piece,
-                metadata=meta2
+        return (
+            Document(
+                page_content=t[s:s + size],
+                metadata={**base_meta, "chunk": i}
             )
-            res.append(new_doc)
-
-            #protect against bad settings during runtime
-            if self.overlap >= self.chunk_size:
-                raise ValueError("overlap must stay smaller than chunk_size")
-            start = end - self.overlap
-
-        return res
+            for i, s in enumerate(starts)
+        )
 
     def set_size(self, s: int):
         #change chunk size
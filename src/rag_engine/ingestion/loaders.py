@@ -1,10 +1,24 @@
 from typing import List
-from pathlib import Path
+from collections import defaultdict
 from langchain_core.documents import Document
 import csv
+import mmap
+import os
+
+try:
+    from pypdf import PdfReader
+except ImportError:
+    #pypdf is optional until a pdf is actually loaded
+    PdfReader = None
+
+#txt files at least this big are decoded straight from an mmap
+MMAP_MIN_BYTES = 1 << 20
 
 class DocumentLoader:
     #base class for all loaders
+    #count is the only state, slots keep instances small and lookups fast
+    __slots__ = ("count",)
+
     def __init__(self):
         #how many docs loaded
         self.count =0  
@@ -14,12 +28,10 @@ class DocumentLoader:
         raise NotImplementedError
 
     def _ext_ok(self, p: str, ext: str) -> bool:
-        #check ext
-        try:
-            return p.lower().endswith(ext)
-        except AttributeError:
-            #p is not a string
+        #check ext, only lowercase the tail instead of the whole path
+        if not isinstance(p, str):
             raise TypeError("path must be a string")
+        return p[-len(ext):].lower() == ext
 
     def _add(self, n: int):
         #update count
@@ -31,17 +43,14 @@ class DocumentLoader:
 
 class PDFLoader(DocumentLoader):
     #load pdf files
+    __slots__ = ()
+
     def load(self, paths: List[str]) -> List[Document]:
         out = []
 
-        try:
-            from pypdf import PdfReader
-        except ImportError:
+        if PdfReader is None:
             #keep the old behaviour
             raise ImportError("need pypdf")
-        except Exception as ex:
-            #unexpected import problem
-            raise RuntimeError(f"failed to import pypdf: {ex}") from ex
 
         for p in paths:
             if not self._ext_ok(p, ".pdf"):
@@ -55,24 +64,15 @@ class PDFLoader(DocumentLoader):
                 #pdf file exists but cannot be opened/read
                 raise RuntimeError(f"failed to open pdf: {p}") from ex
 
-            buf = []
-
-            #read pages
-            for pg in reader.pages:
-                try:
-                    txt = pg.extract_text() or ""
-                except Exception:
-                    #if a single page fails, skip its text but keep going
-                    txt = ""
-                buf.append(txt)
-
-            all_txt = "\n".join(buf).strip()
+            #read pages straight into the join, no temp list
+            page_text = self._page_text
+            all_txt = "\n".join(page_text(pg) for pg in reader.pages).strip()
 
             if all_txt:
                 d = Document(
                     page_content=all_txt,
                     metadata={
-                        "name": Path(p).name,
+                        "name": os.path.basename(p),
                         "path": p,
                         "type": "pdf"
                     }
@@ -82,6 +82,15 @@ class PDFLoader(DocumentLoader):
         self._add(len(out))
         return out
 
+    @staticmethod
+    def _page_text(pg) -> str:
+        #text of one page
+        try:
+            return pg.extract_text() or ""
+        except Exception:
+            #if a single page fails, skip its text but keep going
+            return ""
+
     def summary(self):
         #just show count
         return f"pdf: {self.count}"
@@ -93,6 +102,8 @@ class PDFLoader(DocumentLoader):
 
 class TXTLoader(DocumentLoader):
     #load txt files
+    __slots__ = ()
+
     def load(self, paths: List[str]) -> List[Document]:
         out = []
 
@@ -101,8 +112,16 @@ class TXTLoader(DocumentLoader):
                 continue
 
             try:
-                with open(p, encoding="utf-8") as f:
-                    txt = f.read().strip()
+                #one raw read + one decode, skips the text io layer
+                with open(p, "rb") as f:
+                    size = os.fstat(f.fileno()).st_size
+                    if size >= MMAP_MIN_BYTES:
+                        #big file: decode from the mapping, no bytes copy first
+                        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                            txt = str(mm, "utf-8")
+                    else:
+                        txt = f.read().decode("utf-8")
+                txt = txt.replace("\r\n", "\n").strip()
             except FileNotFoundError:
                 raise FileNotFoundError(f"file not found: {p}")
             except UnicodeDecodeError as ex:
@@ -114,7 +133,7 @@ class TXTLoader(DocumentLoader):
             d = Document(
                 page_content=txt,
                 metadata={
-                    "name": Path(p).name,
+                    "name": os.path.basename(p),
                     "path": p,
                     "type": "txt"
                 }
@@ -133,6 +152,8 @@ class TXTLoader(DocumentLoader):
 
 class CSVLoader(DocumentLoader):
     #load csv rows
+    __slots__ = ()
+
     def load(self, paths: List[str]) -> List[Document]:
         out = []
 
@@ -142,19 +163,31 @@ class CSVLoader(DocumentLoader):
 
             try:
                 with open(p, encoding="utf-8", newline="") as f:
-                    r = csv.DictReader(f)
-                    for i, row in enumerate(r):
-                        line = ", ".join(f"{k}={v}" for k, v in row.items())
-                        d = Document(
-                            page_content=line,
-                            metadata={
-                                "name": Path(p).name,
-                                "path": p,
-                                "row": i,
-                                "type": "csv"
-                            }
+                    r = csv.reader(f)
+                    header = next(r, None)
+                    if header is None:
+                        #empty file, nothing to load
+                        continue
+                    #build the "name=" prefixes once instead of per row
+                    keys = [h + "=" for h in header]
+                    #metadata shared by every row of this file, only "row" differs
+                    #basename is a plain string split, no Path object per file
+                    base_meta = {
+                        "name": os.path.basename(p),
+                        "path": p,
+                        "type": "csv"
+                    }
+                    #blank lines are skipped like DictReader did
+                    rows = (row for row in r if row)
+                    #build the whole file's docs in one list and extend once,
+                    #out grows a single time per file instead of per row
+                    out.extend([
+                        Document(
+                            page_content=", ".join([k + v for k, v in zip(keys, row)]),
+                            metadata={**base_meta, "row": i}
                         )
-                        out.append(d)
+                        for i, row in enumerate(rows)
+                    ])
             except FileNotFoundError:
                 raise FileNotFoundError(f"file not found: {p}")
             except csv.Error as ex:
@@ -170,4 +203,32 @@ class CSVLoader(DocumentLoader):
         return f"csv rows: {self.count}"
 
     def reset(self):
-        self.count = 0
\ No newline at end of file
+        self.count = 0
+
+
+#extension -> loader class, built once at import
+_EXT_MAP = {
+    ".pdf": PDFLoader,
+    ".txt": TXTLoader,
+    ".csv": CSVLoader,
+}
+
+
+def load_paths(paths: List[str]) -> List[Document]:
+    #load a mixed list of files, walking the paths once
+    #each loader then only gets its own files instead of scanning all of them
+    if isinstance(paths, str):
+        paths = [paths]
+    groups = defaultdict(list)
+    for p in paths:
+        if not isinstance(p, str):
+            raise TypeError("path must be a string")
+        ext = os.path.splitext(p)[1].lower()
+        if ext not in _EXT_MAP:
+            raise ValueError(f"Unsupported file type: {p}")
+        groups[ext].append(p)
+
+    out = []
+    for ext, group in groups.items():
+        out.extend(_EXT_MAP[ext]().load(group))
+    return out
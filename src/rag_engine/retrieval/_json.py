@@ -0,0 +1,28 @@
+"""
+JSON encoding for Ollama requests, using orjson when it is installed.
+"""
+import json
+
+try:
+    import orjson
+except ImportError:
+    # orjson is optional, the stdlib encoder gives the same payloads
+    orjson = None
+
+HEADERS = {"Content-Type": "application/json"}
+
+def dumps(obj) -> bytes:
+    """
+    Encode obj as compact UTF-8 JSON bytes.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+def loads(data):
+    """
+    Decode JSON from bytes or str.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -0,0 +1,227 @@
+from typing import Dict, List, Optional, Sequence, Set
+import hashlib
+import sqlite3
+import threading
+import numpy as np
+
+class EmbeddingCache:
+    """
+    A content-addressed cache of embeddings keyed on (model, text).
+    Vectors are stored as float32 bytes, in memory or in a SQLite file.
+    """
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._lock = threading.Lock()
+        self._memory: Optional[Dict[str, bytes]] = None
+        self._conn: Optional[sqlite3.Connection] = None
+        if path is None:
+            self._memory = {}
+        else:
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+            )
+            self._conn.commit()
+
+    @staticmethod
+    def key(model: str, text: str) -> str:
+        """
+        Hash of the model name and the text; same inputs always give the same key.
+        """
+        h = hashlib.blake2b(digest_size=32)
+        h.update(model.encode("utf-8"))
+        h.update(b"\x00")
+        h.update(text.encode("utf-8"))
+        return h.hexdigest()
+
+    def get_many(self, model: str, texts: Sequence[str]) -> List[Optional[np.ndarray]]:
+        """
+        Look up several texts at once. Hits are read-only float32 arrays,
+        misses come back as None.
+        """
+        keys = [self.key(model, t) for t in texts]
+        with self._lock:
+            if self._memory is not None:
+                found = {k: self._memory[k] for k in keys if k in self._memory}
+            else:
+                found = {}
+                unique = list(dict.fromkeys(keys))
+                # Stay well under SQLite's bound-parameter limit
+                for i in range(0, len(unique), 500):
+                    part = unique[i:i + 500]
+                    marks = ",".join("?" * len(part))
+                    rows = self._conn.execute(
+                        f"SELECT key, vector FROM embeddings WHERE key IN ({marks})", part
+                    )
+                    found.update(rows)
+        return [
+            np.frombuffer(found[k], dtype=np.float32) if k in found else None
+            for k in keys
+        ]
+
+    def put_many(self, model: str, texts: Sequence[str], vectors: Sequence[Sequence[float]]):
+        """
+        Store one vector per text.
+        """
+        items = [
+            (self.key(model, t), np.asarray(v, dtype=np.float32).tobytes())
+            for t, v in zip(texts, vectors)
+        ]
+        with self._lock:
+            if self._memory is not None:
+                self._memory.update(items)
+            else:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)", items
+                )
+                self._conn.commit()
+
+    def get(self, model: str, text: str) -> Optional[np.ndarray]:
+        return self.get_many(model, [text])[0]
+
+    def put(self, model: str, text: str, vector: Sequence[float]):
+        self.put_many(model, [text], [vector])
+
+    def clear(self):
+        """
+        Remove every cached vector.
+        """
+        with self._lock:
+            if self._memory is not None:
+                self._memory.clear()
+            else:
+                self._conn.execute("DELETE FROM embeddings")
+                self._conn.commit()
+
+    def close(self):
+        """
+        Close the SQLite connection, if any.
+        """
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def __len__(self) -> int:
+        with self._lock:
+            if self._memory is not None:
+                return len(self._memory)
+            return self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+class SemanticCache:
+    """
+    A response cache that matches questions by meaning rather than exact text.
+    A lookup returns the stored answer of the most similar past question asked
+    over the same context documents, when their cosine similarity is at least
+    the threshold. Holds at most max_size answers and evicts the oldest first.
+    """
+    def __init__(self, embedder, threshold: float = 0.92, max_size: int = 1024):
+        if not 0.0 < threshold <= 1.0:
+            raise ValueError("threshold must be in (0, 1]")
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.embedder = embedder
+        self.threshold = threshold
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        # Preallocated on first insert: one unit-length question vector per slot
+        self._matrix: Optional[np.ndarray] = None
+        self._answers: List[Optional[str]] = [None] * max_size
+        self._contexts: List[Optional[str]] = [None] * max_size
+        # Context fingerprint -> slots holding answers for that context
+        self._slots: Dict[str, Set[int]] = {}
+        self._next = 0
+        self._count = 0
+
+    @staticmethod
+    def fingerprint(context_docs: Sequence) -> str:
+        """
+        Hash of the documents' contents, in order.
+        """
+        h = hashlib.blake2b(digest_size=16)
+        for doc in context_docs:
+            h.update(doc.page_content.encode("utf-8"))
+            h.update(b"\x00")
+        return h.hexdigest()
+
+    def embed(self, question: str) -> Optional[np.ndarray]:
+        """
+        The question's unit-length vector, or None if it cannot be normalised.
+        Pass it to lookup and insert to embed the question only once.
+        """
+        v = np.asarray(self.embedder.embed_query(question), dtype=np.float32)
+        norm = np.linalg.norm(v)
+        if v.ndim != 1 or norm == 0:
+            return None
+        return v / norm
+
+    def lookup(self, question: str, context_docs: Sequence = (),
+               vector: Optional[np.ndarray] = None) -> Optional[str]:
+        """
+        Return the cached answer for a similar question over the same context,
+        or None on a miss.
+        """
+        context = self.fingerprint(context_docs)
+        with self._lock:
+            if not self._slots.get(context):
+                return None
+        q = self.embed(question) if vector is None else vector
+        if q is None:
+            return None
+        with self._lock:
+            slots = self._slots.get(context)
+            if not slots or self._matrix.shape[1] != q.shape[0]:
+                return None
+            rows = np.fromiter(slots, dtype=np.intp, count=len(slots))
+            scores = self._matrix[rows] @ q
+            best = int(np.argmax(scores))
+            if scores[best] >= self.threshold:
+                return self._answers[rows[best]]
+        return None
+
+    def insert(self, question: str, answer: str, context_docs: Sequence = (),
+               vector: Optional[np.ndarray] = None):
+        """
+        Remember the answer given for a question over the given context.
+        """
+        q = self.embed(question) if vector is None else vector
+        if q is None:
+            return
+        context = self.fingerprint(context_docs)
+        with self._lock:
+            if self._matrix is None or self._matrix.shape[1] != q.shape[0]:
+                # First entry, or the embedding size changed: start over
+                self._reset()
+                self._matrix = np.empty((self.max_size, q.shape[0]), dtype=np.float32)
+            slot = self._next
+            old = self._contexts[slot]
+            if old is not None:
+                # Ring buffer is full: drop the oldest answer
+                self._slots[old].discard(slot)
+                if not self._slots[old]:
+                    del self._slots[old]
+            else:
+                self._count += 1
+            self._matrix[slot] = q
+            self._answers[slot] = answer
+            self._contexts[slot] = context
+            self._slots.setdefault(context, set()).add(slot)
+            self._next = (slot + 1) % self.max_size
+
+    def _reset(self):
+        self._matrix = None
+        self._answers = [None] * self.max_size
+        self._contexts = [None] * self.max_size
+        self._slots = {}
+        self._next = 0
+        self._count = 0
+
+    def clear(self):
+        """
+        Forget all cached answers.
+        """
+        with self._lock:
+            self._reset()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._count
@@ -8,5 +8,11 @@ class Document:
         self.page_content = page_content
         self.metadata = metadata if metadata is not None else {}
 
+    def formatted(self) -> str:
+        """
+        The document as it appears in an answer prompt.
+        """
+        return f"Source: {self.metadata}\nContent: {self.page_content}"
+
     def __repr__(self):
         return f"Document(page_content='{self.page_content[:50]}...', metadata={self.metadata})"
@@ -1,9 +1,36 @@
-from typing import List, Dict, Any
-import json
-import urllib.request
-import urllib.error
+from typing import List, Dict, Any, Iterator, Optional, Tuple, Union
+import asyncio
+import contextlib
+import functools
+import os
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from . import _json
+from .cache import SemanticCache
 from .data_models import Document
 
+def _num_parallel(default: int = 4) -> int:
+    # Ollama reads 0 as "auto"; a semaphore needs at least one slot
+    try:
+        return max(1, int(os.environ.get("OLLAMA_NUM_PARALLEL", default)))
+    except ValueError:
+        return default
+
+# Ollama serves this many requests at once per model; async batches stay under it
+OLLAMA_NUM_PARALLEL = _num_parallel()
+
+def _generate_payload(model: str, prompt: str, stream: bool, max_tokens: Optional[int]) -> Dict[str, Any]:
+    payload = {
+        "model": model,
+        "prompt": prompt,
+        "stream": stream
+    }
+    if max_tokens is not None:
+        # Ollama stops generating after num_predict tokens
+        payload["options"] = {"num_predict": max_tokens}
+    return payload
+
 class GenerationError(Exception):
     """
     Custom exception for generation errors.
@@ -17,67 +44,310 @@ class Ollama:
     """
     A simple Ollama client to connect to Ollama.
     """
-    def __init__(self, model: str, base_url: str = "http://localhost:11434"):
+    def __init__(self, model: str, base_url: str = "http://localhost:11434", timeout: Union[float, Tuple[float, Optional[float]]] = (5, None), cache_size: int = 1024):
         self.model = model
         self.base_url = base_url
+        # (connect, read): fail fast when Ollama is down, but let a long
+        # generation on a slow host take as long as it needs
+        self.timeout = timeout
+        # Identical (model, prompt) pairs are answered from memory instead of
+        # calling the LLM again; failed calls are never cached
+        self._complete_cached = functools.lru_cache(maxsize=cache_size)(self._complete_uncached)
+        # Keep-alive session so repeated calls reuse the same TCP connection
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=32)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
 
-    def complete(self, prompt: str) -> str:
+    def complete(self, prompt: str, max_tokens: Optional[int] = None) -> str:
         """
         Structure an instruction prompt for the LLM.
+        max_tokens caps the length of the completion (None = no cap).
         """
+        return self._complete_cached(self.model, prompt, max_tokens)
+
+    def _complete_uncached(self, model: str, prompt: str, max_tokens: Optional[int]) -> str:
         url = f"{self.base_url}/api/generate"
-        payload = {
-            "model": self.model,
-            "prompt": prompt,
-            "stream": False
-        }
-        data = json.dumps(payload).encode("utf-8")
+        payload = _generate_payload(model, prompt, False, max_tokens)
         
-        req = urllib.request.Request(
-            url, 
-            data=data, 
-            headers={"Content-Type": "application/json"}
+        try:
+            response = self._session.post(url, data=_json.dumps(payload), headers=_json.HEADERS, timeout=self.timeout)
+            if response.status_code != 200:
+                raise GenerationError(f"Ollama API returned status {response.status_code}")
+            result = _json.loads(response.content)
+            return result.get("response", "")
+        except requests.exceptions.ConnectionError as e:
+            raise GenerationError(f"Failed to connect to Ollama at {self.base_url}: {e}", original_error=e)
+        except Exception as e:
+            raise GenerationError(f"An unexpected error occurred during generation: {e}", original_error=e)
+
+    def stream(self, prompt: str, max_tokens: Optional[int] = None) -> Iterator[str]:
+        """
+        Yield the completion piece by piece as Ollama generates it.
+        """
+        url = f"{self.base_url}/api/generate"
+        payload = _generate_payload(self.model, prompt, True, max_tokens)
+        
+        try:
+            with self._session.post(url, data=_json.dumps(payload), headers=_json.HEADERS, timeout=self.timeout, stream=True) as response:
+                if response.status_code != 200:
+                    raise GenerationError(f"Ollama API returned status {response.status_code}")
+                # One JSON object per line until "done"
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    chunk = _json.loads(line)
+                    if "error" in chunk:
+                        raise GenerationError(f"Ollama API returned an error: {chunk['error']}")
+                    piece = chunk.get("response", "")
+                    if piece:
+                        yield piece
+                    if chunk.get("done"):
+                        break
+        except GenerationError:
+            raise
+        except requests.exceptions.ConnectionError as e:
+            raise GenerationError(f"Failed to connect to Ollama at {self.base_url}: {e}", original_error=e)
+        except Exception as e:
+            raise GenerationError(f"An unexpected error occurred during generation: {e}", original_error=e)
+
+    def clear_cache(self):
+        """
+        Forget all cached completions.
+        """
+        self._complete_cached.cache_clear()
+
+    def close(self):
+        """
+        Close the pooled HTTP connections.
+        """
+        self._session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+class AsyncOllama:
+    """
+    An asyncio Ollama client, so many prompts can be in flight at once.
+    """
+    def __init__(self, model: str, base_url: str = "http://localhost:11434", timeout: Union[float, httpx.Timeout] = httpx.Timeout(None, connect=5)):
+        self.model = model
+        self.base_url = base_url
+        # Like Ollama: fail fast on connect, no limit on a long generation
+        self.timeout = timeout
+        self._client = None
+        self._loop = None
+
+    def _new_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            timeout=self.timeout,
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=32)
         )
+
+    def _get_client(self) -> httpx.AsyncClient:
+        # An AsyncClient is tied to the event loop it was first used on,
+        # so a new loop (e.g. a second asyncio.run) gets a new client.
+        # The old one cannot be closed once its loop is gone; use session()
+        # or aclose() to close it while its loop still runs.
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            self._client = self._new_client()
+            self._loop = loop
+        return self._client
+
+    @contextlib.asynccontextmanager
+    async def session(self):
+        """
+        Send the enclosed calls through one fresh client and close it on exit,
+        while the event loop that owns it is still running.
+        """
+        client = self._new_client()
+        previous = self._client, self._loop
+        self._client, self._loop = client, asyncio.get_running_loop()
+        try:
+            yield self
+        finally:
+            self._client, self._loop = previous
+            await client.aclose()
+
+    async def complete(self, prompt: str, max_tokens: Optional[int] = None) -> str:
+        """
+        Async version of Ollama.complete.
+        """
+        url = f"{self.base_url}/api/generate"
+        payload = _generate_payload(self.model, prompt, False, max_tokens)
         
         try:
-            with urllib.request.urlopen(req) as response:
-                if response.status != 200:
-                    raise GenerationError(f"Ollama API returned status {response.status}")
-                result = json.loads(response.read().decode("utf-8"))
-                return result.get("response", "")
-        except urllib.error.URLError as e:
+            response = await self._get_client().post(url, content=_json.dumps(payload), headers=_json.HEADERS)
+            if response.status_code != 200:
+                raise GenerationError(f"Ollama API returned status {response.status_code}")
+            result = _json.loads(response.content)
+            return result.get("response", "")
+        except httpx.ConnectError as e:
             raise GenerationError(f"Failed to connect to Ollama at {self.base_url}: {e}", original_error=e)
         except Exception as e:
             raise GenerationError(f"An unexpected error occurred during generation: {e}", original_error=e)
 
+    async def aclose(self):
+        """
+        Close the pooled HTTP connections.
+        """
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._loop = None
+
 class LLMGenerator:
-    def __init__(self, model: str = "llama3.1"):
+    # Output caps per task; answers get the most room, ratings the least
+    answer_max_tokens = 512
+    summary_max_tokens = 256
+    evaluation_max_tokens = 128
+    # A single document shorter than this is its own summary
+    short_doc_chars = 500
+
+    def __init__(self, model: str = "llama3.1", semantic_cache: Optional[SemanticCache] = None):
         self.llm = Ollama(model=model)
+        self.allm = AsyncOllama(model=model)
+        # Optional: reuse answers to paraphrased questions without calling the LLM
+        self.semantic_cache = semantic_cache
+
+    def _answer_prompt(self, question: str, context_docs: List[Document]) -> str:
+        # Document.formatted only reads page_content and metadata, so it also
+        # formats langchain_core Documents; a list join is faster than a generator
+        context_str = "\n\n".join([Document.formatted(doc) for doc in context_docs])
+        return f"Use the following context to answer the question:\n\n{context_str}\n\nQuestion: {question}\nAnswer:"
+
+    def _cached_answer(self, question: str, context_docs: List[Document], vector) -> Optional[str]:
+        if vector is None:
+            return None
+        return self.semantic_cache.lookup(question, context_docs, vector=vector)
+
+    def _cache_answer(self, question: str, answer: str, context_docs: List[Document], vector):
+        if self.semantic_cache is not None and vector is not None:
+            self.semantic_cache.insert(question, answer, context_docs, vector=vector)
 
     def generate_answer(self, question: str, context_docs: List[Document]) -> str:
         """
         Generate an answer to a question using the LLM.
         """
         try:
-            context_str = "\n\n".join(
-                f"Source: {doc.metadata}\nContent: {doc.page_content}" 
-                for doc in context_docs
-            )
-            prompt = f"Use the following context to answer the question:\n\n{context_str}\n\nQuestion: {question}\nAnswer:"
-            
-            response = self.llm.complete(prompt)
-            return str(response)
+            vector = None
+            if self.semantic_cache is not None:
+                # Embed the question once for both the lookup and the insert
+                vector = self.semantic_cache.embed(question)
+                cached = self._cached_answer(question, context_docs, vector)
+                if cached is not None:
+                    return cached
+            prompt = self._answer_prompt(question, context_docs)
+            response = str(self.llm.complete(prompt, max_tokens=self.answer_max_tokens))
+            self._cache_answer(question, response, context_docs, vector)
+            return response
+        except Exception as e:
+            raise GenerationError(f"Failed to generate answer: {e}", original_error=e)
+
+    def generate_answer_stream(self, question: str, context_docs: List[Document]) -> Iterator[str]:
+        """
+        Like generate_answer, but yields the answer as it is generated.
+        """
+        prompt = self._answer_prompt(question, context_docs)
+        yield from self.llm.stream(prompt, max_tokens=self.answer_max_tokens)
+
+    async def agenerate_answer(self, question: str, context_docs: List[Document]) -> str:
+        """
+        Async version of generate_answer.
+        """
+        try:
+            vector = None
+            if self.semantic_cache is not None:
+                # The embedder is synchronous; keep it off the event loop
+                vector = await asyncio.to_thread(self.semantic_cache.embed, question)
+                cached = self._cached_answer(question, context_docs, vector)
+                if cached is not None:
+                    return cached
+            prompt = self._answer_prompt(question, context_docs)
+            response = str(await self.allm.complete(prompt, max_tokens=self.answer_max_tokens))
+            self._cache_answer(question, response, context_docs, vector)
+            return response
         except Exception as e:
             raise GenerationError(f"Failed to generate answer: {e}", original_error=e)
 
+    async def generate_batch(self, questions: List[str], context_docs_list: List[List[Document]]) -> List[str]:
+        """
+        Answer many questions concurrently, at most OLLAMA_NUM_PARALLEL at a time.
+        Answers are returned in the same order as the questions.
+        """
+        if len(questions) != len(context_docs_list):
+            raise ValueError("questions and context_docs_list must have the same length")
+        
+        semaphore = asyncio.Semaphore(OLLAMA_NUM_PARALLEL)
+        
+        async def _one(question, context_docs):
+            async with semaphore:
+                return await self.agenerate_answer(question, context_docs)
+        
+        async with self.allm.session():
+            return await asyncio.gather(
+                *(_one(q, c) for q, c in zip(questions, context_docs_list))
+            )
+
+    def _summary_prompt(self, docs: List[Document]) -> str:
+        context_str = "\n\n".join([doc.page_content for doc in docs])
+        return f"Summarize the following text in concise bullet points:\n\n{context_str}\n\nSummary:"
+
+    def _trivial_summary(self, docs: List[Document]) -> Optional[str]:
+        """
+        Summary for inputs that do not need the LLM, or None.
+        """
+        if not docs:
+            return ""
+        if len(docs) == 1 and len(docs[0].page_content) < self.short_doc_chars:
+            return f"- {docs[0].page_content.strip()}"
+        return None
+
+    def _trivial_evaluation(self, question: str, answer: str) -> Optional[str]:
+        """
+        Rating for answers that do not need the LLM, or None.
+        """
+        if not answer or not answer.strip():
+            return "1/10 - The answer is empty."
+        if answer.strip() == question.strip():
+            return "1/10 - The answer only repeats the question."
+        return None
+
+    def _relevance_prompt(self, question: str, answer: str) -> str:
+        return (
+            f"Question: {question}\n"
+            f"Answer: {answer}\n\n"
+            "Rate the relevance of the answer to the question on a scale of 1 to 10. "
+            "Provide a brief explanation for your rating."
+        )
+
     def summarize_docs(self, docs: List[Document]) -> str:
         """
         Generate a bullet-point summary from a list of documents.
         """
+        trivial = self._trivial_summary(docs)
+        if trivial is not None:
+            return trivial
+        try:
+            prompt = self._summary_prompt(docs)
+            return self.llm.complete(prompt, max_tokens=self.summary_max_tokens)
+        except Exception as e:
+            raise GenerationError(f"Failed to summarize documents: {e}", original_error=e)
+
+    async def asummarize_docs(self, docs: List[Document]) -> str:
+        """
+        Async version of summarize_docs.
+        """
+        trivial = self._trivial_summary(docs)
+        if trivial is not None:
+            return trivial
         try:
-            context_str = "\n\n".join(doc.page_content for doc in docs)
-            prompt = f"Summarize the following text in concise bullet points:\n\n{context_str}\n\nSummary:"
-            return self.llm.complete(prompt)
+            prompt = self._summary_prompt(docs)
+            return await self.allm.complete(prompt, max_tokens=self.summary_max_tokens)
         except Exception as e:
             raise GenerationError(f"Failed to summarize documents: {e}", original_error=e)
 
@@ -85,13 +355,46 @@ class LLMGenerator:
         """
         Ask the LLM to rate the relevance of the answer to the question.
         """
+        trivial = self._trivial_evaluation(question, answer)
+        if trivial is not None:
+            return trivial
         try:
-            prompt = (
-                f"Question: {question}\n"
-                f"Answer: {answer}\n\n"
-                "Rate the relevance of the answer to the question on a scale of 1 to 10. "
-                "Provide a brief explanation for your rating."
-            )
-            return self.llm.complete(prompt)
+            prompt = self._relevance_prompt(question, answer)
+            return self.llm.complete(prompt, max_tokens=self.evaluation_max_tokens)
         except Exception as e:
-            raise GenerationError(f"Failed to evaluate relevance: {e}", original_error=e)
\ No newline at end of file
+            raise GenerationError(f"Failed to evaluate relevance: {e}", original_error=e)
+
+    async def aevaluate_relevance(self, question: str, answer: str) -> str:
+        """
+        Async version of evaluate_relevance.
+        """
+        trivial = self._trivial_evaluation(question, answer)
+        if trivial is not None:
+            return trivial
+        try:
+            prompt = self._relevance_prompt(question, answer)
+            return await self.allm.complete(prompt, max_tokens=self.evaluation_max_tokens)
+        except Exception as e:
+            raise GenerationError(f"Failed to evaluate relevance: {e}", original_error=e)
+
+    async def answer_and_evaluate(self, question: str, docs: List[Document]) -> Dict[str, str]:
+        """
+        Answer a question, summarize its context and rate the answer in one call.
+        The answer and summary are generated concurrently; the rating needs the
+        answer, so it runs once the answer is ready.
+        Returns a dict with "answer", "summary" and "evaluation".
+        """
+        async with self.allm.session():
+            answer, summary = await asyncio.gather(
+                self.agenerate_answer(question, docs),
+                self.asummarize_docs(docs)
+            )
+            evaluation = await self.aevaluate_relevance(question, answer)
+        return {"answer": answer, "summary": summary, "evaluation": evaluation}
+
+    async def aclose(self):
+        """
+        Close the async client's connections. Call this before the event loop
+        that used them ends, e.g. at the end of an asyncio.run.
+        """
+        await self.allm.aclose()
@@ -1,10 +1,20 @@
-from typing import List, Tuple
-import json
-import urllib.request
-import urllib.error
+from typing import List, Optional, Tuple
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import httpx
+import numpy as np
+import requests
+from requests.adapters import HTTPAdapter
+from . import _json
+from .cache import EmbeddingCache
 from .data_models import Document
+from .generator import OLLAMA_NUM_PARALLEL
 from ..indexing.vector_store import VectorStore
 
+logger = logging.getLogger(__name__)
+
 class RetrievalError(Exception):
     """
     Custom exception for retrieval errors.
@@ -14,51 +24,284 @@ class RetrievalError(Exception):
         self.message = message
         self.original_error = original_error
 
+def _as_rows(vectors) -> List[np.ndarray]:
+    """
+    Pack vectors into one contiguous float32 matrix and return its rows.
+    A list of rows (rather than the 2D array itself) keeps the usual
+    list behaviour that LangChain vector stores rely on.
+    """
+    return list(np.asarray(vectors, dtype=np.float32))
+
+class _RetryableEmbedError(RetrievalError):
+    """
+    A batch embedding call that timed out or hit a server error; a smaller batch may succeed.
+    """
+
 class OllamaEmbedder:
     """
     A simple Ollama embedder to embed documents and queries.
     """
-    def __init__(self, model: str = "nomic-embed-text", base_url: str = "http://localhost:11434"):
+    def __init__(self, model: str = "nomic-embed-text", base_url: str = "http://localhost:11434", timeout: float = 60, cache: Optional[EmbeddingCache] = None, embed_batch_size: int = 32, max_workers: Optional[int] = None):
+        if embed_batch_size < 1:
+            raise ValueError("embed_batch_size must be >= 1")
         self.model = model
         self.base_url = base_url
+        self.timeout = timeout
+        self.cache = cache
+        # Texts per /api/embed request; halved automatically when a batch times out
+        self.embed_batch_size = embed_batch_size
+        self._batch_size_lock = threading.Lock()
+        # Batches in flight at once, matching the slots Ollama serves in parallel
+        self.max_workers = max_workers if max_workers is not None else OLLAMA_NUM_PARALLEL
+        self._batch_url = f"{base_url}/api/embed"
+        # Keep-alive session so repeated calls reuse the same TCP connection
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=32)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
 
-    def _get_embedding(self, text: str) -> List[float]:
+    def _get_embedding(self, text: str) -> np.ndarray:
         url = f"{self.base_url}/api/embeddings"
         payload = {
             "model": self.model,
             "prompt": text
         }
-        data = json.dumps(payload).encode("utf-8")
         
-        req = urllib.request.Request(
-            url, 
-            data=data, 
-            headers={"Content-Type": "application/json"}
-        )
+        try:
+            response = self._session.post(url, data=_json.dumps(payload), headers=_json.HEADERS, timeout=self.timeout)
+            if response.status_code != 200:
+                raise RetrievalError(f"Ollama API returned status {response.status_code}")
+            result = _json.loads(response.content)
+            return np.asarray(result.get("embedding", []), dtype=np.float32)
+        except requests.exceptions.ConnectionError as e:
+            raise RetrievalError(f"Failed to connect to Ollama at {self.base_url}: {e}", original_error=e)
+        except Exception as e:
+            raise RetrievalError(f"An unexpected error occurred during embedding: {e}", original_error=e)
+
+    def _get_embeddings_batch(self, texts: List[str]) -> Optional[List[np.ndarray]]:
+        """
+        Embed all texts with a single request to the /api/embed endpoint.
+        Returns None when the server does not support batch embedding.
+        """
+        payload = {
+            "model": self.model,
+            "input": texts
+        }
         
         try:
-            with urllib.request.urlopen(req) as response:
-                if response.status != 200:
-                    raise RetrievalError(f"Ollama API returned status {response.status}")
-                result = json.loads(response.read().decode("utf-8"))
-                return result.get("embedding", [])
-        except urllib.error.URLError as e:
+            response = self._session.post(self._batch_url, data=_json.dumps(payload), headers=_json.HEADERS, timeout=self.timeout)
+            # Older Ollama versions have no /api/embed endpoint
+            if response.status_code == 404:
+                return None
+            if response.status_code >= 500:
+                raise _RetryableEmbedError(f"Ollama API returned status {response.status_code}")
+            if response.status_code != 200:
+                raise RetrievalError(f"Ollama API returned status {response.status_code}")
+            result = _json.loads(response.content)
+        except RetrievalError:
+            raise
+        except requests.exceptions.ConnectionError as e:
             raise RetrievalError(f"Failed to connect to Ollama at {self.base_url}: {e}", original_error=e)
+        except requests.exceptions.Timeout as e:
+            raise _RetryableEmbedError(f"Ollama API timed out after {self.timeout}s", original_error=e)
         except Exception as e:
             raise RetrievalError(f"An unexpected error occurred during embedding: {e}", original_error=e)
+        
+        embeddings = result.get("embeddings")
+        if embeddings is None or len(embeddings) != len(texts):
+            return None
+        return _as_rows(embeddings)
+
+    def close(self):
+        """
+        Close the pooled HTTP connections.
+        """
+        self._session.close()
 
-    def embed_query(self, text: str) -> List[float]:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def embed_query(self, text: str) -> np.ndarray:
         try:
-            return self._get_embedding(text)
+            if self.cache is None:
+                return self._get_embedding(text)
+            # Query vectors come from /api/embeddings rather than /api/embed,
+            # so they are cached under their own key space
+            query_model = f"{self.model}:query"
+            embedding = self.cache.get(query_model, text)
+            if embedding is None:
+                embedding = self._get_embedding(text)
+                self.cache.put(query_model, text, embedding)
+            return embedding
         except Exception as e:
             raise RetrievalError(f"Error embedding query: {e}", original_error=e)
 
-    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+    def embed_queries(self, texts: List[str]) -> List[np.ndarray]:
+        """
+        Embed many queries. Each vector is what embed_query would return for
+        that text; uncached queries are sent max_workers at a time.
+        """
+        texts = list(texts)
+        if not texts:
+            return []
         try:
+            if self.cache is None:
+                return self._embed_queries_uncached(texts)
+            query_model = f"{self.model}:query"
+            embeddings = self.cache.get_many(query_model, texts)
+            misses = list(dict.fromkeys(t for t, e in zip(texts, embeddings) if e is None))
+            if misses:
+                fresh = dict(zip(misses, self._embed_queries_uncached(misses)))
+                self.cache.put_many(query_model, misses, [fresh[t] for t in misses])
+                embeddings = [fresh[t] if e is None else e for t, e in zip(texts, embeddings)]
+            return embeddings
+        except Exception as e:
+            raise RetrievalError(f"Error embedding queries: {e}", original_error=e)
+
+    def _embed_queries_uncached(self, texts: List[str]) -> List[np.ndarray]:
+        # /api/embeddings takes one prompt per request
+        workers = min(self.max_workers, len(texts))
+        if workers <= 1:
             return [self._get_embedding(text) for text in texts]
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(self._get_embedding, texts))
+
+    def _embed_slice(self, part: List[str]) -> List[np.ndarray]:
+        try:
+            embeddings = self._get_embeddings_batch(part)
+        except _RetryableEmbedError:
+            if len(part) == 1:
+                raise
+            # Too much for this server: halve the batch and retry both halves
+            half = len(part) // 2
+            with self._batch_size_lock:
+                self.embed_batch_size = min(self.embed_batch_size, half)
+            logger.warning(
+                "Embedding batch of %d texts failed, retrying with batch size %d",
+                len(part), half
+            )
+            return self._embed_slice(part[:half]) + self._embed_slice(part[half:])
+        if embeddings is None:
+            embeddings = [self._get_embedding(text) for text in part]
+        return list(embeddings)
+
+    def _embed_uncached(self, texts: List[str]) -> List[np.ndarray]:
+        # One round-trip per embed_batch_size texts instead of one per text
+        size = self.embed_batch_size
+        slices = [texts[i:i + size] for i in range(0, len(texts), size)]
+        workers = min(self.max_workers, len(slices))
+        if workers <= 1:
+            results = [self._embed_slice(part) for part in slices]
+        else:
+            # Threads are enough here: each worker spends its time waiting on
+            # Ollama, and they all share the pooled session
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(self._embed_slice, slices))
+        if self.embed_batch_size < size:
+            logger.info("Embedding batch size settled at %d", self.embed_batch_size)
+        return [e for part in results for e in part]
+
+    def embed_documents(self, texts: List[str]) -> List[np.ndarray]:
+        """
+        Embed many texts. Each vector is a float32 numpy array.
+        """
+        texts = list(texts)
+        if not texts:
+            return []
+        try:
+            if self.cache is None:
+                return self._embed_uncached(texts)
+            
+            # Serve hits from the cache and send only the misses to Ollama
+            embeddings = self.cache.get_many(self.model, texts)
+            misses = list(dict.fromkeys(t for t, e in zip(texts, embeddings) if e is None))
+            if misses:
+                fresh = dict(zip(misses, self._embed_uncached(misses)))
+                self.cache.put_many(self.model, misses, [fresh[t] for t in misses])
+                embeddings = [fresh[t] if e is None else e for t, e in zip(texts, embeddings)]
+            return embeddings
         except Exception as e:
             raise RetrievalError(f"Error embedding documents: {e}", original_error=e)
 
+class AsyncOllamaEmbedder:
+    """
+    An asyncio Ollama embedder, for embedding alongside other async work.
+    Its HTTP client is bound to one event loop, so use it as an async context
+    manager (or await aclose) inside the loop that uses it.
+    """
+    def __init__(self, model: str = "nomic-embed-text", base_url: str = "http://localhost:11434", timeout: float = 60):
+        self.model = model
+        self.base_url = base_url
+        self.timeout = timeout
+        self._client = None
+        self._loop = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        # An AsyncClient is tied to the event loop it was first used on
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            self._client = httpx.AsyncClient(timeout=self.timeout)
+            self._loop = loop
+        return self._client
+
+    async def _post(self, path: str, payload: dict) -> httpx.Response:
+        try:
+            return await self._get_client().post(f"{self.base_url}{path}", content=_json.dumps(payload), headers=_json.HEADERS)
+        except httpx.ConnectError as e:
+            raise RetrievalError(f"Failed to connect to Ollama at {self.base_url}: {e}", original_error=e)
+
+    async def aembed_query(self, text: str) -> np.ndarray:
+        # Same endpoint as OllamaEmbedder.embed_query, so both give the same vector
+        try:
+            response = await self._post("/api/embeddings", {"model": self.model, "prompt": text})
+            if response.status_code != 200:
+                raise RetrievalError(f"Ollama API returned status {response.status_code}")
+            return np.asarray(_json.loads(response.content).get("embedding", []), dtype=np.float32)
+        except Exception as e:
+            raise RetrievalError(f"Error embedding query: {e}", original_error=e)
+
+    async def aembed_documents(self, texts: List[str]) -> List[np.ndarray]:
+        texts = list(texts)
+        if not texts:
+            return []
+        try:
+            response = await self._post("/api/embed", {"model": self.model, "input": texts})
+            if response.status_code == 200:
+                embeddings = _json.loads(response.content).get("embeddings")
+                if embeddings is not None and len(embeddings) == len(texts):
+                    return _as_rows(embeddings)
+            elif response.status_code != 404:
+                raise RetrievalError(f"Ollama API returned status {response.status_code}")
+            
+            # Older Ollama versions: one /api/embeddings call per text, sent concurrently
+            responses = await asyncio.gather(
+                *(self._post("/api/embeddings", {"model": self.model, "prompt": t}) for t in texts)
+            )
+            for r in responses:
+                if r.status_code != 200:
+                    raise RetrievalError(f"Ollama API returned status {r.status_code}")
+            return [np.asarray(_json.loads(r.content).get("embedding", []), dtype=np.float32) for r in responses]
+        except Exception as e:
+            raise RetrievalError(f"Error embedding documents: {e}", original_error=e)
+
+    async def aclose(self):
+        """
+        Close the pooled HTTP connections.
+        """
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._loop = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+
 class Retriever:
     """
     A simple retriever to retrieve documents from a vector store.
@@ -78,14 +321,41 @@ class Retriever:
         except Exception as e:
             raise RetrievalError(f"Failed to retrieve documents: {e}", original_error=e)
 
+    def retrieve_batch(self, queries: List[str], k: int = 5, filter: dict = None) -> List[List[Document]]:
+        """
+        Retrieve documents for many queries with one vector search.
+        Returns one list of documents per query, in query order.
+        """
+        queries = list(queries)
+        if not queries:
+            return []
+        try:
+            # Query vectors, not document vectors: same endpoint and cache keys as retrieve.
+            # Embedders without a batched query method (e.g. the indexing Embedder) go one by one.
+            embed_queries = getattr(self.embedder, "embed_queries", None)
+            if embed_queries is not None:
+                vectors = embed_queries(queries)
+            else:
+                vectors = [self.embedder.embed_query(q) for q in queries]
+            embeddings = np.asarray(vectors, dtype=np.float32)
+            results = self.vs.search_by_vectors(embeddings, k=k, filter=filter)
+            return [
+                [Document(page_content=d.page_content, metadata=d.metadata) for d in docs]
+                for docs in results
+            ]
+        except Exception as e:
+            raise RetrievalError(f"Failed to retrieve documents in batch: {e}", original_error=e)
+
     def retrieve_with_scores(self, query: str, k: int = 5) -> List[Tuple[Document, float]]:
         """
         Retrieve documents along with their similarity scores.
         """
         try:
-            # Chroma returns (doc, score) tuples when using similarity_search_with_score
-            results = self.vs.store.similarity_search_with_score(query, k=k)
-            
+            # Embed through our embedder (and its cache) so Chroma does not embed the query again.
+            # Scores are the same distances similarity_search_with_score returns.
+            embedding = self.embedder.embed_query(query)
+            results = self.vs.store.similarity_search_by_vector_with_relevance_scores(embedding, k=k)
+
             output = []
             for doc, score in results:
                 new_doc = Document(page_content=doc.page_content, metadata=doc.metadata)
@@ -5,12 +5,6 @@ Combines all test classes into a single test suite for comprehensive testing.
 
 import unittest
 import sys
-import os
-
-current_dir = os.path.dirname(os.path.abspath(__file__))
-parent_dir = os.path.dirname(current_dir)
-grandparent_dir = os.path.dirname(parent_dir)
-sys.path.insert(0, grandparent_dir)
 
 from test_embedder import (
     TestEmbedderInitialization,
@@ -34,6 +28,30 @@ from test_index_engine import (
     TestIndexingEngineBatchProcessing
 )
 
+# The one list of test classes, grouped by the component they cover
+TEST_GROUPS = [
+    ("Embedder", [
+        TestEmbedderInitialization,
+        TestEmbedderTextPreprocessing,
+        TestEmbedderQueryEmbedding,
+        TestEmbedderBatchProcessing,
+        TestEmbedderUtilityMethods
+    ]),
+    ("VectorStore", [
+        TestVectorStoreInitialization,
+        TestVectorStoreAddDocuments,
+        TestVectorStoreSearch,
+        TestVectorStoreUtilities
+    ]),
+    ("IndexingEngine", [
+        TestIndexingEngineInitialization,
+        TestIndexingEngineValidation,
+        TestIndexingEngineIndexing,
+        TestIndexingEngineBatchProcessing
+    ])
+]
+
+
 def create_test_suite():
     """
     Creates a test suite containing all test classes.
@@ -49,30 +67,14 @@ def create_test_suite():
     print("=" * 70)
     
     # Adding tests
-    print("\nAdding Embedder Tests...")
-    suite.addTests(loader.loadTestsFromTestCase(TestEmbedderInitialization))
-    suite.addTests(loader.loadTestsFromTestCase(TestEmbedderTextPreprocessing))
-    suite.addTests(loader.loadTestsFromTestCase(TestEmbedderQueryEmbedding))
-    suite.addTests(loader.loadTestsFromTestCase(TestEmbedderBatchProcessing))
-    suite.addTests(loader.loadTestsFromTestCase(TestEmbedderUtilityMethods))
-    print(f"  Added 5 test classes for Embedder")
-    
-    print("\nAdding VectorStore Tests...")
-    suite.addTests(loader.loadTestsFromTestCase(TestVectorStoreInitialization))
-    suite.addTests(loader.loadTestsFromTestCase(TestVectorStoreAddDocuments))
-    suite.addTests(loader.loadTestsFromTestCase(TestVectorStoreSearch))
-    suite.addTests(loader.loadTestsFromTestCase(TestVectorStoreUtilities))
-    print(f"  Added 4 test classes for VectorStore")
-    
-    print("\nAdding IndexingEngine Tests...")
-    suite.addTests(loader.loadTestsFromTestCase(TestIndexingEngineInitialization))
-    suite.addTests(loader.loadTestsFromTestCase(TestIndexingEngineValidation))
-    suite.addTests(loader.loadTestsFromTestCase(TestIndexingEngineIndexing))
-    suite.addTests(loader.loadTestsFromTestCase(TestIndexingEngineBatchProcessing))
-    print(f"  Added 4 test classes for IndexingEngine")
+    for component, test_classes in TEST_GROUPS:
+        print(f"\nAdding {component} Tests...")
+        for test_class in test_classes:
+            suite.addTests(loader.loadTestsFromTestCase(test_class))
+        print(f"  Added {len(test_classes)} test classes for {component}")
     
     print("\n" + "=" * 70)
-    print(f"TOTAL TEST CLASSES: 13")
+    print(f"TOTAL TEST CLASSES: {sum(len(classes) for _, classes in TEST_GROUPS)}")
     print(f"TOTAL TEST CASES: {suite.countTestCases()}")
     print("=" * 70)
     return suite
@@ -81,6 +83,8 @@ def create_test_suite():
 def run_test_suite():
     """
     Runs the complete test suite with detailed reporting.
+    Everything runs in this process, so the classes that load the
+    embedding model share the one cached engine.
     """
     suite = create_test_suite()
     runner = unittest.TextTestRunner(verbosity=2)
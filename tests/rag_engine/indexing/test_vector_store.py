@@ -4,16 +4,10 @@ Tests document storage, retrieval, and analytics with error handling.
 """
 
 import unittest
-import sys
 import os
 import shutil
 from langchain_core.documents import Document
 
-current_dir = os.path.dirname(os.path.abspath(__file__))
-parent_dir = os.path.dirname(current_dir)
-grandparent_dir = os.path.dirname(parent_dir)
-sys.path.insert(0, grandparent_dir)
-
 from rag_engine.indexing.embedder import Embedder
 from rag_engine.indexing.vector_store import VectorStore
 
@@ -33,8 +27,7 @@ class TestVectorStoreInitialization(unittest.TestCase):
         """Clean up class-level resources."""
         print("=== Finished TestVectorStoreInitialization ===")
         del cls.embedder
-        if os.path.exists(cls.test_dir):
-            shutil.rmtree(cls.test_dir)
+        shutil.rmtree(cls.test_dir, ignore_errors=True)
     
     def setUp(self):
         """Set up test fixtures."""
@@ -90,8 +83,7 @@ class TestVectorStoreAddDocuments(unittest.TestCase):
         """Clean up class-level resources."""
         print("=== Finished TestVectorStoreAddDocuments ===")
         del cls.embedder
-        if os.path.exists(cls.test_dir):
-            shutil.rmtree(cls.test_dir)
+        shutil.rmtree(cls.test_dir, ignore_errors=True)
     
     def setUp(self):
         """Set up test fixtures."""
@@ -198,8 +190,7 @@ class TestVectorStoreSearch(unittest.TestCase):
         print("=== Finished TestVectorStoreSearch ===")
         del cls.vector_store
         del cls.embedder
-        if os.path.exists(cls.test_dir):
-            shutil.rmtree(cls.test_dir)
+        shutil.rmtree(cls.test_dir, ignore_errors=True)
     
     def setUp(self):
         """Set up test fixtures."""
@@ -296,8 +287,7 @@ class TestVectorStoreUtilities(unittest.TestCase):
         print("=== Finished TestVectorStoreUtilities ===")
         del cls.vector_store
         del cls.embedder
-        if os.path.exists(cls.test_dir):
-            shutil.rmtree(cls.test_dir)
+        shutil.rmtree(cls.test_dir, ignore_errors=True)
     
     def setUp(self):
         """Set up test fixtures."""
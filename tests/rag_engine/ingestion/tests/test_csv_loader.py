@@ -1,6 +1,7 @@
 import unittest
 from ..loaders import CSVLoader
 import csv
+import contextlib
 import os
 
 class TestCSVLoader(unittest.TestCase):
@@ -26,7 +27,7 @@ class TestCSVLoader(unittest.TestCase):
     @classmethod
     def tearDownClass(cls):
         #cleanup
-        if os.path.exists(cls.sample_csv):
+        with contextlib.suppress(FileNotFoundError):
             os.remove(cls.sample_csv)
 
     def test_load_rows(self):
@@ -1,10 +1,6 @@
 import unittest
-import sys
-import os
-
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../..")))
-
 from ..loaders import PDFLoader
+import contextlib
 import os
 
 class TestPDFLoader(unittest.TestCase):
@@ -27,7 +23,7 @@ class TestPDFLoader(unittest.TestCase):
     @classmethod
     def tearDownClass(cls):
         #cleanup
-        if os.path.exists(cls.sample_pdf):
+        with contextlib.suppress(FileNotFoundError):
             os.remove(cls.sample_pdf)
 
     def test_import_error(self):
@@ -1,5 +1,6 @@
 import unittest
 from ..loaders import TXTLoader
+import contextlib
 import os
 
 class TestTXTLoader(unittest.TestCase):
@@ -22,7 +23,7 @@ class TestTXTLoader(unittest.TestCase):
     @classmethod
     def tearDownClass(cls):
         #cleanup
-        if os.path.exists(cls.sample_txt):
+        with contextlib.suppress(FileNotFoundError):
             os.remove(cls.sample_txt)
 
     def test_load_basic(self):
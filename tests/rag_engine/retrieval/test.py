@@ -4,25 +4,57 @@ Retrieval Subpackage Demo
 This script demonstrates how to use the components of the `retrieval` subpackage.
 """
 
-import sys
-import os
-from unittest.mock import MagicMock
+from rag_engine.retrieval.retriever import Retriever
+from rag_engine.retrieval.data_models import Document
 
-# Add the project root to the python path so we can import rag_engine
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
 
-from rag_engine.retrieval.retriever import Retriever, OllamaEmbedder
-from rag_engine.retrieval.generator import LLMGenerator
-from rag_engine.retrieval.data_models import Document
+class StubStore:
+    """
+    Stands in for the Chroma store: every search returns the same documents.
+    """
+    def __init__(self, docs):
+        self.docs = docs
+
+    def similarity_search_by_vector(self, embedding, k=5, filter=None):
+        return self.docs
+
+
+class StubVectorStore:
+    """
+    Stands in for VectorStore, exposing only the `store` attribute the Retriever uses.
+    """
+    def __init__(self, docs):
+        self.store = StubStore(docs)
+
+
+class StubEmbedder:
+    """
+    Stands in for OllamaEmbedder with a fixed dummy embedding.
+    """
+    def embed_query(self, text):
+        return [0.1, 0.2, 0.3]
+
+
+class StubGenerator:
+    """
+    Stands in for LLMGenerator with canned responses.
+    """
+    def generate_answer(self, question, context_docs):
+        return "Python is a high-level programming language created by Guido van Rossum."
+
+    def summarize_docs(self, docs):
+        return "- Python is high-level\n- Created by Guido van Rossum\n- Supports multiple paradigms"
+
+    def evaluate_relevance(self, question, answer):
+        return "Rating: 10/10\nExplanation: The answer accurately defines Python."
+
 
 def main():
     print("\nStarting Retrieval Subpackage Demo...\n")
 
     # 1. Setup Mock Vector Store
     # We mock the vector store to return sample documents without needing a real DB
-    print("Initializing components (with mocked VectorStore)...")
-    
-    mock_vs = MagicMock()
+    print("Initializing components (with stubbed VectorStore)...")
     
     # Define some sample documents that our "database" contains
     sample_docs = [
@@ -40,22 +72,18 @@ def main():
         )
     ]
     
-    # Mock the similarity search to return our sample docs
-    # We need to return objects that have page_content and metadata attributes
-    mock_vs.store.similarity_search_by_vector.return_value = sample_docs
-
-    # 2. Initialize Components (with Mocks)
-    # We mock the embedder to avoid needing a real Ollama instance for this demo
-    embedder = MagicMock(spec=OllamaEmbedder)
-    embedder.embed_query.return_value = [0.1, 0.2, 0.3] # Dummy embedding
+    # The stub store's similarity search returns our sample docs
+    # They have the page_content and metadata attributes the Retriever reads
+    vs = StubVectorStore(sample_docs)
+
+    # 2. Initialize Components (with Stubs)
+    # We stub the embedder to avoid needing a real Ollama instance for this demo
+    embedder = StubEmbedder()
     
-    retriever = Retriever(vector_store=mock_vs, embedder=embedder)
+    retriever = Retriever(vector_store=vs, embedder=embedder)
     
-    # We mock the generator to avoid needing a real Ollama instance
-    generator = MagicMock(spec=LLMGenerator)
-    generator.generate_answer.return_value = "Python is a high-level programming language created by Guido van Rossum."
-    generator.summarize_docs.return_value = "- Python is high-level\n- Created by Guido van Rossum\n- Supports multiple paradigms"
-    generator.evaluate_relevance.return_value = "Rating: 10/10\nExplanation: The answer accurately defines Python."
+    # We stub the generator to avoid needing a real Ollama instance
+    generator = StubGenerator()
 
     # 3. Demonstrate Retrieval
     query = "What is Python?"
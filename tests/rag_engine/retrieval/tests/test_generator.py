@@ -13,7 +13,7 @@ class TestGenerator(unittest.TestCase):
             Document("Content 2", {"id": 2})
         ]
         cls.question = "What is this?"
-        cls.mock_response_content = json.dumps({"response": "Mocked Answer"}).encode("utf-8")
+        cls.mock_response_content = {"response": "Mocked Answer"}
 
     @classmethod
     def tearDownClass(cls):
@@ -25,33 +25,34 @@ class TestGenerator(unittest.TestCase):
         self.generator = LLMGenerator()
         # Create a mock response object structure
         self.mock_response = MagicMock()
-        self.mock_response.status = 200
-        self.mock_response.read.return_value = self.mock_response_content
-        self.mock_response.__enter__.return_value = self.mock_response
-        self.mock_response.__exit__.return_value = None
+        self.mock_response.status_code = 200
+        self.mock_response.content = json.dumps(self.mock_response_content).encode("utf-8")
 
     def tearDown(self):
         del self.generator
         del self.mock_response
 
-    @patch('rag_engine.retrieval.generator.urllib.request.urlopen')
-    def test_generate_answer(self, mock_urlopen):
-        mock_urlopen.return_value = self.mock_response
+    def _patch_post(self):
+        patcher = patch.object(self.generator.llm._session, "post", return_value=self.mock_response)
+        self.addCleanup(patcher.stop)
+        return patcher.start()
+
+    def test_generate_answer(self):
+        mock_post = self._patch_post()
         
         answer = self.generator.generate_answer(self.question, self.docs)
         
         self.assertEqual(answer, "Mocked Answer")
         self.assertIsInstance(answer, str)
         self.assertTrue(len(answer) > 0)
-        self.assertTrue(mock_urlopen.called)
+        self.assertTrue(mock_post.called)
 
-    @patch('rag_engine.retrieval.generator.urllib.request.urlopen')
-    def test_summarize_docs(self, mock_urlopen):
-        mock_urlopen.return_value = self.mock_response
+    def test_summarize_docs(self):
+        mock_post = self._patch_post()
         
         summary = self.generator.summarize_docs(self.docs)
         
         self.assertEqual(summary, "Mocked Answer")
         self.assertIsInstance(summary, str)
         self.assertNotEqual(summary, "")
-        self.assertTrue(mock_urlopen.called)
+        self.assertTrue(mock_post.called)
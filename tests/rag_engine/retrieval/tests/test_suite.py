@@ -1,13 +1,10 @@
 import unittest
 import sys
-import os
 
-# Add the project root to the path so we can import rag_engine and tests
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
-
-from rag_engine.retrieval.tests.test_data_models import TestDataModels
-from rag_engine.retrieval.tests.test_generator import TestGenerator
-from rag_engine.retrieval.tests.test_retriever import TestRetriever
+# Run as a module (python -m ...tests.test_suite) so these resolve
+from .test_data_models import TestDataModels
+from .test_generator import TestGenerator
+from .test_retriever import TestRetriever
 
 def suite():
     test_suite = unittest.TestSuite()
@@ -8,8 +8,8 @@ def run_suite():
     root_dir = Path.cwd()
     src_dir = root_dir / "src"
     
+    # rag_engine is imported from the installed package (pip install -e .)
     env = os.environ.copy()
-    env["PYTHONPATH"] = str(src_dir) + os.pathsep + env.get("PYTHONPATH", "")
 
     print(f"Starting Test Suite...")
     print(f"Source Directory: {src_dir}")
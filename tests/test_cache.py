@@ -0,0 +1,117 @@
+import unittest
+from unittest.mock import MagicMock
+import os
+import tempfile
+from rag_engine.retrieval.cache import EmbeddingCache, SemanticCache
+from rag_engine.retrieval.data_models import Document
+
+class TestEmbeddingCache(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.model = "nomic-embed-text"
+        cls.vector = [0.5, 0.25, -1.0]
+
+    @classmethod
+    def tearDownClass(cls):
+        del cls.model
+        del cls.vector
+
+    def setUp(self):
+        self.cache = EmbeddingCache()
+
+    def tearDown(self):
+        self.cache.close()
+        del self.cache
+
+    def test_put_and_get(self):
+        self.assertIsNone(self.cache.get(self.model, "hello"))
+        self.cache.put(self.model, "hello", self.vector)
+
+        self.assertEqual(self.cache.get(self.model, "hello").tolist(), self.vector)
+        self.assertEqual(len(self.cache), 1)
+        # Same text under another model is a different entry
+        self.assertIsNone(self.cache.get("other-model", "hello"))
+
+    def test_get_many_partial(self):
+        self.cache.put_many(self.model, ["a", "b"], [self.vector, self.vector])
+
+        result = self.cache.get_many(self.model, ["a", "x", "b"])
+
+        self.assertIsNone(result[1])
+        self.assertEqual(result[0].tolist(), self.vector)
+        self.assertEqual(result[2].tolist(), self.vector)
+        self.cache.clear()
+        self.assertEqual(len(self.cache), 0)
+
+    def test_sqlite_persistence(self):
+        fd, path = tempfile.mkstemp(suffix=".sqlite")
+        os.close(fd)
+        try:
+            first = EmbeddingCache(path)
+            first.put(self.model, "hello", self.vector)
+            first.close()
+
+            second = EmbeddingCache(path)
+            self.assertEqual(second.get(self.model, "hello").tolist(), self.vector)
+            second.close()
+        finally:
+            os.remove(path)
+
+
+class TestSemanticCache(unittest.TestCase):
+
+    def setUp(self):
+        vectors = {
+            "What is Python?": [1.0, 0.0, 0.0],
+            "Tell me about Python": [0.99, 0.1, 0.0],
+            "How do I bake bread?": [0.0, 1.0, 0.0],
+        }
+        self.embedder = MagicMock()
+        self.embedder.embed_query.side_effect = lambda q: vectors[q]
+        self.cache = SemanticCache(self.embedder, threshold=0.92)
+
+    def tearDown(self):
+        del self.cache
+        del self.embedder
+
+    def test_paraphrase_hit(self):
+        self.assertIsNone(self.cache.lookup("What is Python?"))
+        self.cache.insert("What is Python?", "A programming language.")
+
+        self.assertEqual(self.cache.lookup("Tell me about Python"), "A programming language.")
+        self.assertIsNone(self.cache.lookup("How do I bake bread?"))
+        self.assertEqual(len(self.cache), 1)
+
+    def test_context_must_match(self):
+        docs = [Document("Python is a language.", {})]
+        self.cache.insert("What is Python?", "A programming language.", docs)
+
+        self.assertIsNone(self.cache.lookup("Tell me about Python"))
+        self.assertIsNone(self.cache.lookup("Tell me about Python", [Document("A snake.", {})]))
+        self.assertEqual(
+            self.cache.lookup("Tell me about Python", [Document("Python is a language.", {"id": 2})]),
+            "A programming language.",
+        )
+
+    def test_vector_reused(self):
+        vector = self.cache.embed("What is Python?")
+        self.assertIsNone(self.cache.lookup("What is Python?", vector=vector))
+        self.cache.insert("What is Python?", "A programming language.", vector=vector)
+
+        self.assertEqual(self.embedder.embed_query.call_count, 1)
+
+    def test_evicts_oldest(self):
+        cache = SemanticCache(self.embedder, threshold=0.92, max_size=1)
+        cache.insert("What is Python?", "A programming language.")
+        cache.insert("How do I bake bread?", "Knead, rise, bake.")
+
+        self.assertEqual(len(cache), 1)
+        self.assertIsNone(cache.lookup("Tell me about Python"))
+        self.assertEqual(cache.lookup("How do I bake bread?"), "Knead, rise, bake.")
+
+    def test_bad_threshold(self):
+        with self.assertRaises(ValueError):
+            SemanticCache(self.embedder, threshold=0)
+        with self.assertRaises(ValueError):
+            SemanticCache(self.embedder, max_size=0)
@@ -1,6 +1,7 @@
 import unittest
-from rag_engine.ingestion.loaders import CSVLoader
+from rag_engine.ingestion.loaders import CSVLoader, load_paths
 import csv
+import contextlib
 import os
 
 class TestCSVLoader(unittest.TestCase):
@@ -26,7 +27,7 @@ class TestCSVLoader(unittest.TestCase):
     @classmethod
     def tearDownClass(cls):
         #cleanup
-        if os.path.exists(cls.sample_csv):
+        with contextlib.suppress(FileNotFoundError):
             os.remove(cls.sample_csv)
 
     def test_load_rows(self):
@@ -43,4 +44,18 @@ class TestCSVLoader(unittest.TestCase):
         self.assertEqual(len(out), 0)
         self.assertEqual(self.loader.count, 0)
         self.assertIsInstance(out, list)
-        self.assertIn("csv", self.loader.summary())
\ No newline at end of file
+        self.assertIn("csv", self.loader.summary())
+
+    def test_load_paths_mixed(self):
+        #one call, each file goes to its own loader
+        txt = "mixed.txt"
+        with open(txt, "w", encoding="utf-8") as f:
+            f.write("hello")
+        try:
+            out = load_paths([self.sample_csv, txt])
+        finally:
+            os.remove(txt)
+        types = sorted(d.metadata["type"] for d in out)
+        self.assertEqual(types, ["csv", "csv", "txt"])
+        with self.assertRaises(ValueError):
+            load_paths(["bad.docx"])
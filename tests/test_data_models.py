@@ -44,3 +44,15 @@ class TestDataModels(unittest.TestCase):
         long_content = "a" * 100
         doc_long = Document(long_content)
         self.assertTrue(len(repr(doc_long)) < len(long_content) + 100) 
+
+    def test_document_formatted(self):
+        formatted = self.doc_with_meta.formatted()
+        
+        self.assertTrue(formatted.startswith("Source: "))
+        self.assertIn(f"Content: {self.sample_content}", formatted)
+        self.assertIn("test_source", formatted)
+        # Reflects metadata changes made after the first call
+        doc = Document(self.sample_content, {"page": 1})
+        doc.formatted()
+        doc.metadata["page"] = 2
+        self.assertIn("'page': 2", doc.formatted())
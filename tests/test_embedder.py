@@ -4,13 +4,6 @@ Tests embedding functionality with error handling and edge cases.
 """
 
 import unittest
-import sys
-import os
-
-current_dir = os.path.dirname(os.path.abspath(__file__))
-parent_dir = os.path.dirname(current_dir)
-grandparent_dir = os.path.dirname(parent_dir)
-sys.path.insert(0, grandparent_dir)
 
 from rag_engine.indexing.embedder import Embedder
 
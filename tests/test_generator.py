@@ -1,8 +1,13 @@
 import unittest
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
+import asyncio
 import json
-from rag_engine.retrieval.generator import LLMGenerator
+import os
+import httpx
+import requests
+from rag_engine.retrieval.generator import LLMGenerator, GenerationError, _num_parallel
 from rag_engine.retrieval.data_models import Document
+from langchain_core.documents import Document as LCDocument
 
 class TestGenerator(unittest.TestCase):
     
@@ -13,7 +18,7 @@ class TestGenerator(unittest.TestCase):
             Document("Content 2", {"id": 2})
         ]
         cls.question = "What is this?"
-        cls.mock_response_content = json.dumps({"response": "Mocked Answer"}).encode("utf-8")
+        cls.mock_response_content = {"response": "Mocked Answer"}
 
     @classmethod
     def tearDownClass(cls):
@@ -25,33 +30,200 @@ class TestGenerator(unittest.TestCase):
         self.generator = LLMGenerator()
         # Create a mock response object structure
         self.mock_response = MagicMock()
-        self.mock_response.status = 200
-        self.mock_response.read.return_value = self.mock_response_content
-        self.mock_response.__enter__.return_value = self.mock_response
-        self.mock_response.__exit__.return_value = None
+        self.mock_response.status_code = 200
+        self.mock_response.content = json.dumps(self.mock_response_content).encode("utf-8")
 
     def tearDown(self):
         del self.generator
         del self.mock_response
 
-    @patch('rag_engine.retrieval.generator.urllib.request.urlopen')
-    def test_generate_answer(self, mock_urlopen):
-        mock_urlopen.return_value = self.mock_response
+    def _patch_post(self):
+        patcher = patch.object(self.generator.llm._session, "post", return_value=self.mock_response)
+        self.addCleanup(patcher.stop)
+        return patcher.start()
+
+    def test_generate_answer(self):
+        mock_post = self._patch_post()
         
         answer = self.generator.generate_answer(self.question, self.docs)
         
         self.assertEqual(answer, "Mocked Answer")
         self.assertIsInstance(answer, str)
         self.assertTrue(len(answer) > 0)
-        self.assertTrue(mock_urlopen.called)
+        self.assertTrue(mock_post.called)
 
-    @patch('rag_engine.retrieval.generator.urllib.request.urlopen')
-    def test_summarize_docs(self, mock_urlopen):
-        mock_urlopen.return_value = self.mock_response
+    def test_summarize_docs(self):
+        mock_post = self._patch_post()
         
         summary = self.generator.summarize_docs(self.docs)
         
         self.assertEqual(summary, "Mocked Answer")
         self.assertIsInstance(summary, str)
         self.assertNotEqual(summary, "")
-        self.assertTrue(mock_urlopen.called)
+        self.assertTrue(mock_post.called)
+
+    def test_summarize_trivial_inputs(self):
+        mock_post = self._patch_post()
+
+        self.assertEqual(self.generator.summarize_docs([]), "")
+        self.assertEqual(self.generator.summarize_docs([Document("  Short note. ", {})]), "- Short note.")
+        self.assertEqual(self.generator.evaluate_relevance(self.question, "  "), "1/10 - The answer is empty.")
+        mock_post.assert_not_called()
+
+    def test_no_read_timeout_by_default(self):
+        mock_post = self._patch_post()
+
+        self.generator.llm.complete("slow prompt")
+
+        self.assertEqual(mock_post.call_args[1]["timeout"], (5, None))
+        client = self.generator.allm._new_client()
+        self.assertEqual(client.timeout, httpx.Timeout(None, connect=5))
+        asyncio.run(client.aclose())
+
+    def test_connection_error(self):
+        mock_post = self._patch_post()
+        mock_post.side_effect = requests.exceptions.ConnectionError("refused")
+
+        with self.assertRaises(GenerationError) as ctx:
+            self.generator.llm.complete("hi")
+        self.assertIn("Failed to connect", str(ctx.exception))
+
+    def test_generate_batch(self):
+        # Echo the prompt's question line back so order can be checked
+        async def fake_complete(prompt, max_tokens=None):
+            return prompt.rsplit("Question: ", 1)[1].split("\n")[0]
+
+        questions = ["q1", "q2", "q3"]
+        with patch.object(self.generator.allm, "complete", AsyncMock(side_effect=fake_complete)) as mock_complete:
+            answers = asyncio.run(
+                self.generator.generate_batch(questions, [self.docs] * len(questions))
+            )
+
+        self.assertEqual(answers, questions)
+        self.assertEqual(mock_complete.await_count, 3)
+        with self.assertRaises(ValueError):
+            asyncio.run(self.generator.generate_batch(questions, [self.docs]))
+
+    def test_generate_batch_closes_its_client(self):
+        clients = []
+
+        async def fake_complete(prompt, max_tokens=None):
+            clients.append(self.generator.allm._get_client())
+            return "Answer"
+
+        with patch.object(self.generator.allm, "complete", AsyncMock(side_effect=fake_complete)):
+            asyncio.run(self.generator.generate_batch(["q1", "q2"], [self.docs] * 2))
+
+        # One client for the whole batch, closed before the loop ended
+        self.assertEqual(len({id(c) for c in clients}), 1)
+        self.assertTrue(clients[0].is_closed)
+        self.assertIsNone(self.generator.allm._client)
+
+    def test_num_parallel_env(self):
+        for value, expected in [("8", 8), ("0", 1), ("-2", 1), ("auto", 4)]:
+            with self.subTest(value=value), patch.dict(os.environ, {"OLLAMA_NUM_PARALLEL": value}):
+                self.assertEqual(_num_parallel(), expected)
+
+    def test_complete_cache(self):
+        mock_post = self._patch_post()
+
+        first = self.generator.llm.complete("same prompt")
+        second = self.generator.llm.complete("same prompt")
+
+        self.assertEqual(first, second)
+        self.assertEqual(mock_post.call_count, 1)
+        self.generator.llm.clear_cache()
+        self.generator.llm.complete("same prompt")
+        self.assertEqual(mock_post.call_count, 2)
+
+    def test_generate_answer_semantic_cache(self):
+        mock_post = self._patch_post()
+        cache = MagicMock()
+        cache.lookup.return_value = "Cached Answer"
+        generator = LLMGenerator(semantic_cache=cache)
+
+        answer = generator.generate_answer(self.question, self.docs)
+
+        self.assertEqual(answer, "Cached Answer")
+        self.assertFalse(mock_post.called)
+        cache.insert.assert_not_called()
+        cache.embed.assert_called_once_with(self.question)
+        cache.lookup.assert_called_once_with(self.question, self.docs, vector=cache.embed.return_value)
+
+    def test_agenerate_answer_semantic_cache(self):
+        cache = MagicMock()
+        cache.lookup.return_value = None
+        generator = LLMGenerator(semantic_cache=cache)
+
+        with patch.object(generator.allm, "complete", AsyncMock(return_value="Fresh Answer")) as mock_complete:
+            answer = asyncio.run(generator.agenerate_answer(self.question, self.docs))
+            cache.lookup.return_value = "Fresh Answer"
+            again = asyncio.run(generator.agenerate_answer(self.question, self.docs))
+
+        self.assertEqual((answer, again), ("Fresh Answer", "Fresh Answer"))
+        self.assertEqual(mock_complete.await_count, 1)
+        cache.insert.assert_called_once_with(
+            self.question, "Fresh Answer", self.docs, vector=cache.embed.return_value
+        )
+
+    def test_answer_prompt_foreign_documents(self):
+        docs = [LCDocument(page_content="Content 1", metadata={"id": 1}), Document("Content 2", {"id": 2})]
+        prompt = self.generator._answer_prompt(self.question, docs)
+
+        self.assertIn("Source: {'id': 1}\nContent: Content 1", prompt)
+        self.assertIn(docs[1].formatted(), prompt)
+
+    def test_generate_answer_stream(self):
+        lines = [
+            json.dumps({"response": "Mocked ", "done": False}).encode("utf-8"),
+            b"",
+            json.dumps({"response": "Answer", "done": False}).encode("utf-8"),
+            json.dumps({"response": "", "done": True}).encode("utf-8"),
+        ]
+        self.mock_response.iter_lines.return_value = iter(lines)
+        self.mock_response.__enter__.return_value = self.mock_response
+        mock_post = self._patch_post()
+
+        pieces = list(self.generator.generate_answer_stream(self.question, self.docs))
+
+        self.assertEqual(pieces, ["Mocked ", "Answer"])
+        self.assertTrue(mock_post.call_args[1]["stream"])
+        self.assertTrue(json.loads(mock_post.call_args[1]["data"])["stream"])
+
+    def test_answer_and_evaluate(self):
+        async def fake_complete(prompt, max_tokens=None):
+            if prompt.startswith("Summarize"):
+                return "Summary"
+            if prompt.startswith("Question:"):
+                return "Rating: 9"
+            return "Answer"
+
+        with patch.object(self.generator.allm, "complete", AsyncMock(side_effect=fake_complete)) as mock_complete:
+            result = asyncio.run(self.generator.answer_and_evaluate(self.question, self.docs))
+
+        self.assertEqual(result, {"answer": "Answer", "summary": "Summary", "evaluation": "Rating: 9"})
+        self.assertEqual(mock_complete.await_count, 3)
+        # The rating prompt is built from the generated answer
+        self.assertIn("Answer: Answer", mock_complete.await_args_list[-1][0][0])
+
+    def test_aclose(self):
+        async def use_and_close():
+            client = self.generator.allm._get_client()
+            await self.generator.aclose()
+            return client
+
+        client = asyncio.run(use_and_close())
+
+        self.assertTrue(client.is_closed)
+        self.assertIsNone(self.generator.allm._client)
+
+    def test_max_tokens(self):
+        mock_post = self._patch_post()
+
+        self.generator.summarize_docs(self.docs)
+        summary_payload = json.loads(mock_post.call_args[1]["data"])
+        self.generator.llm.complete("no cap")
+        plain_payload = json.loads(mock_post.call_args[1]["data"])
+
+        self.assertEqual(summary_payload["options"], {"num_predict": LLMGenerator.summary_max_tokens})
+        self.assertNotIn("options", plain_payload)
@@ -1,41 +1,18 @@
-import shutil
-import time
-import gc
-import os
-
-def robust_teardown(cls):
-    # Helper to forcefully clean up ChromaDB on Windows
-    if hasattr(cls, 'indexer'): del cls.indexer
-    if hasattr(cls, 'vector_store'): del cls.vector_store
-    gc.collect()
-    time.sleep(0.5)
-    if hasattr(cls, 'test_dir') and os.path.exists(cls.test_dir):
-        for i in range(3):
-            try:
-                shutil.rmtree(cls.test_dir)
-                break
-            except PermissionError:
-                time.sleep(1.0)
 """
 Unit tests for the IndexingEngine module.
 Tests file indexing, validation, and orchestration with error handling.
 """
 
 import unittest
-import sys
+import logging
+import io
+import contextlib
+from unittest.mock import patch
 import os
 import shutil
 import time
 import gc
 
-
-
-current_dir = os.path.dirname(os.path.abspath(__file__))
-parent_dir = os.path.dirname(current_dir)
-grandparent_dir = os.path.dirname(parent_dir)
-sys.path.insert(0, grandparent_dir)
-
-
 from rag_engine.indexing.index_engine import (
     IndexingEngine,
     IndexingException,
@@ -45,6 +22,27 @@ from rag_engine.indexing.index_engine import (
     StorageError
 )
 
+# Banners are debug-only, run pytest with --log-level=DEBUG to see them
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
+
+def robust_teardown(cls):
+    # Helper to forcefully clean up ChromaDB on Windows
+    if hasattr(cls, 'indexer'): del cls.indexer
+    if hasattr(cls, 'vector_store'): del cls.vector_store
+    gc.collect()
+    # Only wait when a file is still locked, not on every teardown
+    if hasattr(cls, 'test_dir'):
+        for i in range(3):
+            try:
+                shutil.rmtree(cls.test_dir)
+                break
+            except FileNotFoundError:
+                break
+            except PermissionError:
+                time.sleep(0.05 * (i + 1))
+
 
 class TestIndexingEngineInitialization(unittest.TestCase):
     """Test cases for IndexingEngine initialization."""
@@ -52,9 +50,92 @@ class TestIndexingEngineInitialization(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
         """Set up class-level resources."""
-        print("\n=== Starting TestIndexingEngineInitialization ===")
+        logger.debug("Starting TestIndexingEngineInitialization")
         cls.test_dir = "./test_ie_init"
     
     @classmethod
     def tearDownClass(cls):
-        robust_teardown(cls)
\ No newline at end of file
+        robust_teardown(cls)
+
+class TestIndexingEngineParallelBatch(unittest.TestCase):
+    """Test cases for thread-pooled batch indexing."""
+
+    def setUp(self):
+        """Build an engine with the heavy components mocked out."""
+        with patch("rag_engine.indexing.index_engine.Embedder"), \
+             patch("rag_engine.indexing.index_engine.VectorStore"):
+            self.indexer = IndexingEngine(persist_dir=None)
+
+    def test_parallel_results_keep_input_order(self):
+        """Results come back keyed in input order regardless of completion order."""
+        paths = [f"file_{i}.txt" for i in range(5)]
+        with patch.object(self.indexer, "index", side_effect=lambda p, **kw: [p]):
+            results = self.indexer.batch_index(paths, verbose=False, max_workers=3)
+        self.assertEqual(list(results), paths)
+        self.assertEqual(results["file_2.txt"], ["file_2.txt"])
+
+    def test_parallel_continue_on_error(self):
+        """A failing file yields an empty result when continue_on_error is set."""
+        def fake_index(path, **kw):
+            if path == "bad.txt":
+                raise FileNotFoundError(path)
+            return [path]
+
+        with patch.object(self.indexer, "index", side_effect=fake_index):
+            results = self.indexer.batch_index(
+                ["a.txt", "bad.txt", "b.txt"], verbose=False, max_workers=2
+            )
+        self.assertEqual(results["bad.txt"], [])
+        self.assertEqual(results["a.txt"], ["a.txt"])
+
+    def test_parallel_dedupes_spellings_of_one_file(self):
+        """Two spellings of the same file are indexed once and share the result."""
+        with patch.object(self.indexer, "index", side_effect=lambda p, **kw: [p]) as mock_index:
+            results = self.indexer.batch_index(
+                ["a.txt", "./a.txt", "b.txt"], verbose=False, max_workers=2
+            )
+        self.assertEqual(mock_index.call_count, 2)
+        self.assertEqual(list(results), ["a.txt", "./a.txt", "b.txt"])
+        # As sequentially: the repeat is a duplicate and gets no chunks
+        self.assertEqual(results["a.txt"], ["a.txt"])
+        self.assertEqual(results["./a.txt"], [])
+
+    def test_parallel_duplicates_match_sequential(self):
+        """A repeated path gives the same results and counts in both modes."""
+        paths = ["a.txt", "bad.txt", "a.txt", "./bad.txt", "b.txt"]
+
+        def run(max_workers):
+            indexed = set()
+
+            def fake_index(path, **kw):
+                # Like IndexingEngine.index: a repeat of an indexed file returns []
+                name = os.path.normpath(path)
+                if name == "bad.txt":
+                    raise FileNotFoundError(path)
+                if name in indexed:
+                    return []
+                indexed.add(name)
+                return [name]
+
+            output = io.StringIO()
+            with patch.object(self.indexer, "index", side_effect=fake_index), \
+                 contextlib.redirect_stdout(output):
+                results = self.indexer.batch_index(paths, max_workers=max_workers)
+            summary = [line for line in output.getvalue().splitlines()
+                       if line.startswith(("  Successful:", "  Failed:"))]
+            return results, summary
+
+        sequential = run(1)
+        parallel = run(3)
+        self.assertEqual(parallel, sequential)
+        self.assertEqual(sequential[0], {"a.txt": [], "bad.txt": [], "./bad.txt": [], "b.txt": ["b.txt"]})
+        self.assertEqual(sequential[1], ["  Successful: 3/5", "  Failed: 2/5"])
+
+    def test_parallel_stop_on_error(self):
+        """The first failure is re-raised when continue_on_error is False."""
+        with patch.object(self.indexer, "index", side_effect=FileNotFoundError("x")):
+            with self.assertRaises(FileNotFoundError):
+                self.indexer.batch_index(
+                    ["a.txt", "b.txt"], continue_on_error=False,
+                    verbose=False, max_workers=2
+                )
@@ -1,10 +1,7 @@
 import unittest
-import sys
-import os
-
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../..")))
-
+from unittest.mock import patch
 from rag_engine.ingestion.loaders import PDFLoader
+import contextlib
 import os
 
 class TestPDFLoader(unittest.TestCase):
@@ -27,23 +24,14 @@ class TestPDFLoader(unittest.TestCase):
     @classmethod
     def tearDownClass(cls):
         #cleanup
-        if os.path.exists(cls.sample_pdf):
+        with contextlib.suppress(FileNotFoundError):
             os.remove(cls.sample_pdf)
 
     def test_import_error(self):
         #simulate missing pypdf
-        import builtins
-        original = builtins.__import__
-
-        def fake_import(name, *a):
-            if name == "pypdf":
-                raise ImportError("need pypdf")
-            return original(name, *a)
-
-        builtins.__import__ = fake_import
-        with self.assertRaises(ImportError):
-            self.loader.load([self.sample_pdf])
-        builtins.__import__ = original
+        with patch("rag_engine.ingestion.loaders.PdfReader", None):
+            with self.assertRaises(ImportError):
+                self.loader.load([self.sample_pdf])
 
     def test_ext_filter(self):
         #ignore non pdf
@@ -1,7 +1,13 @@
 import unittest
-from unittest.mock import MagicMock
-from rag_engine.retrieval.retriever import Retriever, OllamaEmbedder
+from unittest.mock import MagicMock, patch
+import asyncio
+import json
+import httpx
+import numpy as np
+from rag_engine.retrieval.retriever import Retriever, OllamaEmbedder, AsyncOllamaEmbedder
 from rag_engine.retrieval.data_models import Document
+from rag_engine.retrieval.cache import EmbeddingCache
+from rag_engine.indexing.embedder import Embedder
 
 class TestRetriever(unittest.TestCase):
     
@@ -48,7 +54,7 @@ class TestRetriever(unittest.TestCase):
         mock_doc_result = MagicMock()
         mock_doc_result.page_content = "Result Content"
         mock_doc_result.metadata = {"id": 1}
-        self.mock_vs.store.similarity_search_with_score.return_value = [(mock_doc_result, 0.95)]
+        self.mock_vs.store.similarity_search_by_vector_with_relevance_scores.return_value = [(mock_doc_result, 0.95)]
         
         results = self.retriever.retrieve_with_scores(self.query)
         
@@ -57,4 +63,206 @@ class TestRetriever(unittest.TestCase):
         self.assertIsInstance(results[0], tuple)
         self.assertIsInstance(results[0][0], Document)
         self.assertEqual(results[0][1], 0.95)
-        self.mock_vs.store.similarity_search_with_score.assert_called_with(self.query, k=5)
+        self.mock_embedder.embed_query.assert_called_once_with(self.query)
+        self.mock_vs.store.similarity_search_by_vector_with_relevance_scores.assert_called_with(
+            self.mock_embedder.embed_query.return_value, k=5
+        )
+        self.mock_vs.store.similarity_search_with_score.assert_not_called()
+
+    def test_retrieve_batch(self):
+        self.mock_embedder.embed_queries.return_value = [[0.1, 0.2, 0.3], [0.3, 0.2, 0.1]]
+        a1, a2, b1 = (MagicMock(page_content=c, metadata=m) for c, m in [("A1", {"id": 1}), ("A2", {}), ("B1", {"id": 3})])
+        self.mock_vs.search_by_vectors.return_value = [[a1, a2], [b1]]
+
+        results = self.retriever.retrieve_batch(["q1", "q2"], k=2)
+
+        self.assertEqual(len(results), 2)
+        self.assertEqual([d.page_content for d in results[0]], ["A1", "A2"])
+        self.assertIsInstance(results[0][0], Document)
+        self.assertEqual(results[1][0].metadata, {"id": 3})
+        self.mock_embedder.embed_queries.assert_called_once_with(["q1", "q2"])
+        self.mock_embedder.embed_documents.assert_not_called()
+        self.assertEqual(self.mock_vs.search_by_vectors.call_count, 1)
+        self.assertEqual(self.mock_vs.search_by_vectors.call_args[1], {"k": 2, "filter": None})
+        self.assertEqual(self.retriever.retrieve_batch([]), [])
+
+    def test_retrieve_batch_indexing_embedder(self):
+        # The engine's default embedder has embed_query but no embed_queries
+        embedder = MagicMock(spec=Embedder)
+        embedder.embed_query.side_effect = lambda q: [0.1, 0.2, 0.3] if q == "q1" else [0.3, 0.2, 0.1]
+        self.mock_vs.search_by_vectors.return_value = [[MagicMock(page_content="A1", metadata={})], []]
+        retriever = Retriever(vector_store=self.mock_vs, embedder=embedder)
+
+        results = retriever.retrieve_batch(["q1", "q2"], k=1)
+
+        self.assertEqual([[d.page_content for d in docs] for docs in results], [["A1"], []])
+        self.assertEqual(embedder.embed_query.call_count, 2)
+        np.testing.assert_allclose(
+            self.mock_vs.search_by_vectors.call_args[0][0], [[0.1, 0.2, 0.3], [0.3, 0.2, 0.1]], rtol=1e-6
+        )
+
+class TestOllamaEmbedder(unittest.TestCase):
+
+    def setUp(self):
+        self.embedder = OllamaEmbedder()
+
+    def tearDown(self):
+        self.embedder.close()
+        del self.embedder
+
+    def _response(self, payload, status_code=200):
+        response = MagicMock()
+        response.status_code = status_code
+        response.content = json.dumps(payload).encode("utf-8")
+        return response
+
+    def test_embed_documents_batch(self):
+        with patch.object(self.embedder._session, "post") as mock_post:
+            mock_post.return_value = self._response({"embeddings": [[0.1], [0.2]]})
+
+            result = self.embedder.embed_documents(["a", "b"])
+
+        np.testing.assert_allclose(result, [[0.1], [0.2]], rtol=1e-6)
+        self.assertEqual(result[0].dtype, np.float32)
+        self.assertEqual(mock_post.call_count, 1)
+        url = mock_post.call_args[0][0]
+        self.assertTrue(url.endswith("/api/embed"))
+        self.assertEqual(json.loads(mock_post.call_args[1]["data"])["input"], ["a", "b"])
+
+    def test_embed_documents_fallback(self):
+        # Old server without /api/embed, so each text is embedded on its own
+        with patch.object(self.embedder._session, "post") as mock_post:
+            mock_post.side_effect = [
+                self._response({}, status_code=404),
+                self._response({"embedding": [0.1]}),
+                self._response({"embedding": [0.2]}),
+            ]
+
+            result = self.embedder.embed_documents(["a", "b"])
+
+        np.testing.assert_allclose(result, [[0.1], [0.2]], rtol=1e-6)
+        self.assertEqual(mock_post.call_count, 3)
+        self.assertEqual(self.embedder.embed_documents([]), [])
+
+    def test_embed_documents_batch_size(self):
+        embedder = OllamaEmbedder(embed_batch_size=4)
+
+        def fake_post(url, data, headers, timeout):
+            texts = json.loads(data)["input"]
+            # Server chokes on more than two texts at once
+            if len(texts) > 2:
+                return self._response({}, status_code=500)
+            return self._response({"embeddings": [[float(len(t))] for t in texts]})
+
+        with patch.object(embedder._session, "post", side_effect=fake_post):
+            with self.assertLogs("rag_engine.retrieval.retriever", level="INFO"):
+                result = embedder.embed_documents(["a", "bb", "ccc", "dddd", "eeeee"])
+
+        np.testing.assert_array_equal(result, [[1.0], [2.0], [3.0], [4.0], [5.0]])
+        self.assertEqual(embedder.embed_batch_size, 2)
+        embedder.close()
+        with self.assertRaises(ValueError):
+            OllamaEmbedder(embed_batch_size=0)
+
+    def test_embed_documents_parallel(self):
+        embedder = OllamaEmbedder(embed_batch_size=2, max_workers=3)
+
+        def fake_post(url, data, headers, timeout):
+            texts = json.loads(data)["input"]
+            return self._response({"embeddings": [[float(len(t))] for t in texts]})
+
+        with patch.object(embedder._session, "post", side_effect=fake_post) as mock_post:
+            result = embedder.embed_documents(["a", "bb", "ccc", "dddd", "eeeee"])
+
+        # Three batches, results kept in input order
+        np.testing.assert_array_equal(result, [[1.0], [2.0], [3.0], [4.0], [5.0]])
+        self.assertEqual(mock_post.call_count, 3)
+        embedder.close()
+
+    def test_embed_documents_cache(self):
+        embedder = OllamaEmbedder(cache=EmbeddingCache())
+        embedder.cache.put(embedder.model, "a", [0.5])
+        with patch.object(embedder._session, "post") as mock_post:
+            mock_post.return_value = self._response({"embeddings": [[0.25]]})
+
+            result = embedder.embed_documents(["a", "b", "b"])
+            again = embedder.embed_documents(["b"])
+
+        # Only the single miss went over the wire
+        np.testing.assert_array_equal(result, [[0.5], [0.25], [0.25]])
+        np.testing.assert_array_equal(again, [[0.25]])
+        self.assertEqual(mock_post.call_count, 1)
+        self.assertEqual(json.loads(mock_post.call_args[1]["data"])["input"], ["b"])
+        embedder.close()
+
+    def test_embed_queries_shares_query_cache(self):
+        embedder = OllamaEmbedder(cache=EmbeddingCache())
+        embedder.cache.put(f"{embedder.model}:query", "a", [0.5])
+        with patch.object(embedder._session, "post") as mock_post:
+            mock_post.return_value = self._response({"embedding": [0.25]})
+
+            result = embedder.embed_queries(["a", "b", "b"])
+            single = embedder.embed_query("b")
+
+        np.testing.assert_array_equal(result, [[0.5], [0.25], [0.25]])
+        np.testing.assert_array_equal(single, [0.25])
+        # One /api/embeddings call for the single miss; embed_query then hits the cache
+        self.assertEqual(mock_post.call_count, 1)
+        self.assertTrue(mock_post.call_args[0][0].endswith("/api/embeddings"))
+        embedder.close()
+
+    def test_context_manager_closes_session(self):
+        embedder = OllamaEmbedder()
+        with patch.object(embedder._session, "close") as mock_close:
+            with embedder as entered:
+                self.assertIs(entered, embedder)
+        mock_close.assert_called_once()
+
+    def test_aembed_documents(self):
+        seen = []
+
+        def handler(request):
+            seen.append(request.url.path)
+            return httpx.Response(200, json={"embeddings": [[0.1], [0.2]]})
+
+        async def run():
+            embedder = AsyncOllamaEmbedder()
+            client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            with patch.object(embedder, "_get_client", return_value=client):
+                result = await embedder.aembed_documents(["a", "b"])
+            await client.aclose()
+            return result
+
+        result = asyncio.run(run())
+        np.testing.assert_allclose(result, [[0.1], [0.2]], rtol=1e-6)
+        self.assertEqual(result[0].dtype, np.float32)
+        self.assertEqual(seen, ["/api/embed"])
+
+    def test_aembed_query_matches_sync_endpoint(self):
+        seen = []
+
+        def handler(request):
+            seen.append((request.url.path, json.loads(request.content)))
+            return httpx.Response(200, json={"embedding": [0.1, 0.2]})
+
+        async def run():
+            embedder = AsyncOllamaEmbedder()
+            client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            with patch.object(embedder, "_get_client", return_value=client):
+                result = await embedder.aembed_query("q")
+            await client.aclose()
+            return result
+
+        result = asyncio.run(run())
+        np.testing.assert_allclose(result, [0.1, 0.2], rtol=1e-6)
+        self.assertEqual(seen, [("/api/embeddings", {"model": "nomic-embed-text", "prompt": "q"})])
+
+    def test_async_context_manager_closes_client(self):
+        async def run():
+            async with AsyncOllamaEmbedder() as embedder:
+                client = embedder._get_client()
+            return embedder, client
+
+        embedder, client = asyncio.run(run())
+        self.assertTrue(client.is_closed)
+        self.assertIsNone(embedder._client)
@@ -39,4 +39,14 @@ class TestTextChunker(unittest.TestCase):
         out = self.ch.chunk_one(doc)
         self.assertTrue(len(out) >= 3)
         self.assertIsInstance(out, list)
-        self.assertTrue(all(isinstance(d.page_content, str) for d in out))
\ No newline at end of file
+        self.assertTrue(all(isinstance(d.page_content, str) for d in out))
+
+    def test_chunk_iter(self):
+        #stream chunks
+        docs = [Document(page_content=self.long_text), Document(page_content="b"*10)]
+        it = self.ch.chunk_iter(docs)
+        self.assertFalse(isinstance(it, list))
+        out = list(it)
+        self.assertEqual(len(out), len(self.ch.chunk_docs(docs)))
+        self.assertEqual(out[-1].page_content, "b"*10)
+        self.assertEqual(out[-1].metadata["chunk"], 0)
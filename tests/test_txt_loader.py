@@ -1,5 +1,7 @@
 import unittest
+from unittest.mock import patch
 from rag_engine.ingestion.loaders import TXTLoader
+import contextlib
 import os
 
 class TestTXTLoader(unittest.TestCase):
@@ -22,7 +24,7 @@ class TestTXTLoader(unittest.TestCase):
     @classmethod
     def tearDownClass(cls):
         #cleanup
-        if os.path.exists(cls.sample_txt):
+        with contextlib.suppress(FileNotFoundError):
             os.remove(cls.sample_txt)
 
     def test_load_basic(self):
@@ -39,4 +41,12 @@ class TestTXTLoader(unittest.TestCase):
         self.assertEqual(len(out), 0)
         self.assertEqual(self.loader.count, 0)
         self.assertIsInstance(out, list)
-        self.assertIn("txt", self.loader.summary())
\ No newline at end of file
+        self.assertIn("txt", self.loader.summary())
+
+    def test_load_mmap(self):
+        #force the mmap path, same text as a normal read
+        with patch("rag_engine.ingestion.loaders.MMAP_MIN_BYTES", 1):
+            out = self.loader.load([self.sample_txt])
+        self.assertEqual(len(out), 1)
+        self.assertEqual(out[0].page_content, "hello")
+        self.assertEqual(out[0].metadata["name"], "t.txt")
@@ -1,39 +1,34 @@
+"""
+Unit tests for the VectorStore module.
+Tests document storage, retrieval, and analytics with error handling.
+"""
+
+import unittest
+import os
 import shutil
 import time
 import gc
-import os
+from langchain_core.documents import Document
+
+from rag_engine.indexing.embedder import Embedder
+from rag_engine.indexing.vector_store import VectorStore
+
 
 def robust_teardown(cls):
     # Helper to forcefully clean up ChromaDB on Windows
     if hasattr(cls, 'indexer'): del cls.indexer
     if hasattr(cls, 'vector_store'): del cls.vector_store
     gc.collect()
-    time.sleep(0.5)
-    if hasattr(cls, 'test_dir') and os.path.exists(cls.test_dir):
+    # Only wait when a file is still locked, not on every teardown
+    if hasattr(cls, 'test_dir'):
         for i in range(3):
             try:
                 shutil.rmtree(cls.test_dir)
                 break
+            except FileNotFoundError:
+                break
             except PermissionError:
-                time.sleep(1.0)
-"""
-Unit tests for the VectorStore module.
-Tests document storage, retrieval, and analytics with error handling.
-"""
-
-import unittest
-import sys
-import os
-import shutil
-from langchain_core.documents import Document
-
-current_dir = os.path.dirname(os.path.abspath(__file__))
-parent_dir = os.path.dirname(current_dir)
-grandparent_dir = os.path.dirname(parent_dir)
-sys.path.insert(0, grandparent_dir)
-
-from rag_engine.indexing.embedder import Embedder
-from rag_engine.indexing.vector_store import VectorStore
+                time.sleep(0.05 * (i + 1))
 
 
 class TestVectorStoreInitialization(unittest.TestCase):
@@ -47,16 +42,11 @@ class TestVectorStoreInitialization(unittest.TestCase):
         cls.test_dir = "./test_vs_init"
     
     @classmethod
-    def tearDownClass_OLD(cls):
+    def tearDownClass(cls):
         """Clean up class-level resources."""
         print("=== Finished TestVectorStoreInitialization ===")
-        del cls.embedder
-        import time
-        time.sleep(0.1)  # Brief delay for file handles
-        import time
-        time.sleep(0.1)  # Brief delay for file handles
-        if os.path.exists(cls.test_dir):
-            shutil.rmtree(cls.test_dir)
+        # robust_teardown drops the store and only sleeps if removal is blocked
+        robust_teardown(cls)
     
     def setUp(self):
         """Set up test fixtures."""
@@ -108,16 +98,11 @@ class TestVectorStoreAddDocuments(unittest.TestCase):
         cls.test_dir = "./test_vs_add"
     
     @classmethod
-    def tearDownClass_OLD(cls):
+    def tearDownClass(cls):
         """Clean up class-level resources."""
         print("=== Finished TestVectorStoreAddDocuments ===")
-        del cls.embedder
-        import time
-        time.sleep(0.1)  # Brief delay for file handles
-        import time
-        time.sleep(0.1)  # Brief delay for file handles
-        if os.path.exists(cls.test_dir):
-            shutil.rmtree(cls.test_dir)
+        # robust_teardown drops the store and only sleeps if removal is blocked
+        robust_teardown(cls)
     
     def setUp(self):
         """Set up test fixtures."""
@@ -216,17 +201,11 @@ class TestVectorStoreSearch(unittest.TestCase):
         cls.vector_store.add_documents(test_docs)
     
     @classmethod
-    def tearDownClass_OLD(cls):
+    def tearDownClass(cls):
         """Clean up class-level resources."""
         print("=== Finished TestVectorStoreSearch ===")
-        del cls.vector_store
-        del cls.embedder
-        import time
-        time.sleep(0.1)  # Brief delay for file handles
-        import time
-        time.sleep(0.1)  # Brief delay for file handles
-        if os.path.exists(cls.test_dir):
-            shutil.rmtree(cls.test_dir)
+        # robust_teardown drops the store and only sleeps if removal is blocked
+        robust_teardown(cls)
     
     def setUp(self):
         """Set up test fixtures."""
@@ -318,17 +297,11 @@ class TestVectorStoreUtilities(unittest.TestCase):
         cls.vector_store.add_documents(test_docs)
     
     @classmethod
-    def tearDownClass_OLD(cls):
+    def tearDownClass(cls):
         """Clean up class-level resources."""
         print("=== Finished TestVectorStoreUtilities ===")
-        del cls.vector_store
-        del cls.embedder
-        import time
-        time.sleep(0.1)  # Brief delay for file handles
-        import time
-        time.sleep(0.1)  # Brief delay for file handles
-        if os.path.exists(cls.test_dir):
-            shutil.rmtree(cls.test_dir)
+        # robust_teardown drops the store and only sleeps if removal is blocked
+        robust_teardown(cls)
     
     def setUp(self):
         """Set up test fixtures."""
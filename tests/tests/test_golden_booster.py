@@ -1,8 +1,8 @@
 
 import unittest
 from unittest.mock import MagicMock, patch, mock_open
-import sys
 import os
+import stat
 
 # Mock the Document class to fix TypeErrors
 class MockDocument:
@@ -32,7 +32,7 @@ class TestGoldenCoverage(unittest.TestCase):
             mock_pdf = MagicMock()
             mock_pdf.pages = [MagicMock(extract_text=lambda: "content")]
             
-            with patch.dict(sys.modules, {'pypdf': MagicMock(PdfReader=lambda x: mock_pdf)}):
+            with patch("rag_engine.ingestion.loaders.PdfReader", lambda x: mock_pdf):
                 l = PDFLoader()
                 docs = l.load(["fake.pdf"])
                 self.assertEqual(len(docs), 1)
@@ -46,6 +46,8 @@ class TestGoldenCoverage(unittest.TestCase):
             MockLoader.return_value.load.return_value = [MockDocument("content")]
             engine.chunker.chunk_docs.return_value = [MockDocument("chunk")]
             
-            with patch("os.path.exists", return_value=True), patch("os.path.isfile", return_value=True), patch("os.path.getsize", return_value=100),                  patch("os.access", return_value=True):
+            # a regular 100-byte file, as seen by the engine's single os.stat
+            fake_stat = os.stat_result((stat.S_IFREG | 0o644, 0, 0, 1, 0, 0, 100, 0, 0, 0))
+            with patch("os.stat", return_value=fake_stat), patch("os.access", return_value=True):
                  engine.index("test.txt")
                  engine.batch_index(["test.txt"])
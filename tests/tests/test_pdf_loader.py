@@ -1,4 +1,5 @@
 import unittest
+from unittest.mock import patch
 import sys
 import os
 
@@ -32,18 +33,9 @@ class TestPDFLoader(unittest.TestCase):
 
     def test_import_error(self):
         #simulate missing pypdf
-        import builtins
-        original = builtins.__import__
-
-        def fake_import(name, *a):
-            if name == "pypdf":
-                raise ImportError("need pypdf")
-            return original(name, *a)
-
-        builtins.__import__ = fake_import
-        with self.assertRaises(ImportError):
-            self.loader.load([self.sample_pdf])
-        builtins.__import__ = original
+        with patch("rag_engine.ingestion.loaders.PdfReader", None):
+            with self.assertRaises(ImportError):
+                self.loader.load([self.sample_pdf])
 
     def test_ext_filter(self):
         #ignore non pdf
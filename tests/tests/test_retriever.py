@@ -48,7 +48,7 @@ class TestRetriever(unittest.TestCase):
         mock_doc_result = MagicMock()
         mock_doc_result.page_content = "Result Content"
         mock_doc_result.metadata = {"id": 1}
-        self.mock_vs.store.similarity_search_with_score.return_value = [(mock_doc_result, 0.95)]
+        self.mock_vs.store.similarity_search_by_vector_with_relevance_scores.return_value = [(mock_doc_result, 0.95)]
         
         results = self.retriever.retrieve_with_scores(self.query)
         
@@ -57,4 +57,8 @@ class TestRetriever(unittest.TestCase):
         self.assertIsInstance(results[0], tuple)
         self.assertIsInstance(results[0][0], Document)
         self.assertEqual(results[0][1], 0.95)
-        self.mock_vs.store.similarity_search_with_score.assert_called_with(self.query, k=5)
+        self.mock_embedder.embed_query.assert_called_once_with(self.query)
+        self.mock_vs.store.similarity_search_by_vector_with_relevance_scores.assert_called_with(
+            self.mock_embedder.embed_query.return_value, k=5
+        )
+        self.mock_vs.store.similarity_search_with_score.assert_not_called()